@@ -1,29 +1,123 @@
-from advent_of_code.utils import (
-    test_input_location,
-    input_location,
-    hex_to_binary,
-    bin_to_dec,
-)
-from advent_of_code.day_14 import FrozenDict
-from advent_of_code.day_16 import (
-    InvalidPacketError,
-    PacketHeader,
-    Packet,
-    LiteralPacket,
-    OperatorPacket,
-    OperatorPacketInfo,
-)
-from advent_of_code.day_18 import (
-    SailFishNumber,
-    Element, 
-    str2sailfishnumber,
-)
-from advent_of_code.day_21 import DeterministicDie, Player
-from advent_of_code.day_22 import Cube
-from advent_of_code.day_23 import (
-    Amphipod,
-    construct_graph,
-    draw_graph,
-    graph_solved,
-    desirable_moves,
-)
+"""
+Advent of Code 2021 support modules.
+
+The names below are loaded lazily (PEP 562): importing the package costs
+nothing, and each day's module is only imported the first time one of
+its names is used, so a worker that only needs utils never pays for
+the others.
+"""
+
+import importlib
+
+_EXPORTS = {
+    "advent_of_code.utils": (
+        "test_input_location",
+        "input_location",
+        "hex_to_binary",
+        "bin_to_dec",
+        "bits_at",
+        "iter_hex_chunks",
+        "BitCursor",
+        "HexStreamReader",
+        "load_input",
+    ),
+    "advent_of_code.day_06": (
+        "LanternFish",
+        "Population",
+        "School",
+        "count_fish",
+    ),
+    "advent_of_code.day_11": ("Octopus", "OctopusGrid", "Cave"),
+    "advent_of_code.day_12": ("CaveGraph",),
+    "advent_of_code.day_14": ("FrozenDict", "PairTransitions"),
+    "advent_of_code.day_15": (
+        "TiledCave",
+        "PathResult",
+        "read_cave",
+        "lowest_risk_path",
+    ),
+    "advent_of_code.day_16": (
+        "InvalidPacketError",
+        "PacketHeader",
+        "Packet",
+        "LiteralPacket",
+        "OperatorPacket",
+        "OperatorPacketInfo",
+        "EventKind",
+        "PacketEvent",
+        "PacketProgram",
+        "StreamResult",
+        "iter_packet_events",
+        "evaluate_stream",
+        "evaluate_file",
+        "compile_packet",
+        "compile_events",
+        "compile_hex",
+        "evaluate_hex",
+    ),
+    "advent_of_code.day_18": (
+        "SailFishNumber",
+        "Element",
+        "str2sailfishnumber",
+        "reduce_in_place",
+        "magnitude_of",
+        "max_pair_magnitude",
+    ),
+    "advent_of_code.day_20": ("Image", "read_algorithm"),
+    "advent_of_code.day_21": (
+        "DeterministicDie",
+        "Player",
+        "DiracRules",
+        "roll_sum_frequencies",
+        "turn_outcomes",
+        "dirac_wins",
+        "GameResult",
+        "fast_forward",
+    ),
+    "advent_of_code.day_22": (
+        "Cube",
+        "BoxTree",
+        "CubeSet",
+        "Reactor",
+        "instruction_to_cube",
+        "read_cubes",
+        "run_sequence",
+        "count_on_inclusion_exclusion",
+        "count_on_disjoint",
+        "count_on_vectorized",
+    ),
+    "advent_of_code.metrics": ("Histogram", "Report"),
+    "advent_of_code.runner": ("PartResult", "run_part"),
+    "advent_of_code.day_24": (
+        "Block",
+        "read_program",
+        "compile_block",
+        "run",
+        "search",
+    ),
+    "advent_of_code.day_25": ("SeaFloor",),
+    # day_23 is not in the tree; these fail with ModuleNotFoundError
+    # when used rather than breaking every import of the package.
+    "advent_of_code.day_23": (
+        "Amphipod",
+        "construct_graph",
+        "draw_graph",
+        "graph_solved",
+        "desirable_moves",
+    ),
+}
+
+_LAZY = {name: module for module, names in _EXPORTS.items() for name in names}
+
+
+def __getattr__(name: str):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
@@ -0,0 +1,38 @@
+"""
+Command line entry point.
+
+    python -m advent_of_code run [DAY ...] [--jobs N] [--json]
+"""
+
+import argparse
+import sys
+from advent_of_code import runner
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m advent_of_code")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser(
+        "run", help="run day solvers and report their time and memory"
+    )
+    run.add_argument("days", nargs="*", type=int, help="days (default all)")
+    run.add_argument("--jobs", "-j", type=int, default=None)
+    run.add_argument("--json", action="store_true", help="print JSON")
+    run.add_argument(
+        "--metrics", action="store_true", help="list each part's counters"
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        results = runner.run(args.days or None, args.jobs)
+    except ValueError as err:
+        parser.error(str(err))
+    if args.json:
+        print(runner.format_json(results))
+    else:
+        print(runner.format_table(results, args.metrics))
+    return 1 if any(r.error for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""
+Advent of Code 2021 - Day 6: Lanternfish
+https://adventofcode.com/2021/day/6
+
+Fish with the same timer behave the same, so the school is a histogram
+of the nine timer values. A day rotates the histogram; a jump of many
+days is the 9x9 transition matrix raised to that power.
+"""
+
+from __future__ import annotations
+from typing import Iterable, List, Optional
+import numpy as np
+from advent_of_code.utils import input_location
+
+AGES = 9  # timers 0 .. 8
+NEW_FISH_TIMER = 8
+RESET_TIMER = 6
+
+# below this many days a day-by-day rotation beats squaring the matrix.
+MATRIX_DAYS = 2048
+
+
+class LanternFish:
+    """
+    Each day we decrease the counter by 1.
+    When the counter goes below 0, we
+       - spawn a new fish with counter = 8
+       - reset this fish to counter 6
+    """
+
+    counter: int
+
+    def __init__(self, init_counter: int = NEW_FISH_TIMER):
+        self.counter = init_counter
+
+    def day_older(self) -> Optional[LanternFish]:
+        baby: LanternFish = None
+        if self.counter == 0:
+            self.counter = RESET_TIMER
+            baby = LanternFish()
+        else:
+            self.counter = self.counter - 1
+
+        return baby
+
+
+def read_input(input_file: str) -> List[int]:
+    """Reads the comma separated fish timers."""
+    initial_state: List[int] = []
+    with open(input_file) as f:
+        for line in f:
+            if line.strip():
+                initial_state.extend(int(x) for x in line.split(","))
+    return initial_state
+
+
+def age_histogram(fish: Iterable[int]) -> List[int]:
+    """Returns the number of fish with each timer value 0 .. 8."""
+    counts = [0] * AGES
+    for timer in fish:
+        counts[timer] += 1
+    return counts
+
+
+def transition_matrix() -> np.ndarray:
+    """
+    The one-day transition as an object (exact integer) matrix: column
+    t holds where the fish with timer t are the next day.
+    """
+    matrix = np.zeros((AGES, AGES), dtype=object)
+    for timer in range(1, AGES):
+        matrix[timer - 1, timer] = 1
+    matrix[RESET_TIMER, 0] = 1
+    matrix[NEW_FISH_TIMER, 0] = 1
+    return matrix
+
+
+def advance_by_matrix(counts: List[int], days: int) -> List[int]:
+    """
+    Returns the histogram days later by repeated squaring of the
+    transition matrix, carrying the histogram along as a vector so only
+    O(log days) 9x9 products are made.
+    """
+    vector = np.array(counts, dtype=object)
+    square = transition_matrix()
+    while days:
+        if days & 1:
+            vector = square @ vector
+        days >>= 1
+        if days:
+            square = square @ square
+    return [int(count) for count in vector]
+
+
+class Population(object):
+    """
+    A school as a histogram of timers, held in a ring: the slot at
+    `zero` holds the fish whose timer is 0. A day only moves `zero` on
+    one slot, so those fish become the newborns (timer 8) where they
+    sit, and adds them to the slot holding timer 6 as they reset.
+    """
+
+    def __init__(self, counts: Iterable[int]):
+        self._ring = list(counts)
+        if len(self._ring) != AGES:
+            raise ValueError(f"Expected {AGES} timer counts.")
+        self._zero = 0
+
+    @classmethod
+    def from_fish(cls, fish: Iterable[int]) -> Population:
+        return cls(age_histogram(fish))
+
+    def histogram(self) -> List[int]:
+        """The number of fish with each timer value 0 .. 8."""
+        return self._ring[self._zero :] + self._ring[: self._zero]
+
+    def total(self) -> int:
+        return sum(self._ring)
+
+    def day(self):
+        """Advances one day."""
+        ring, zero = self._ring, self._zero
+        ring[(zero + RESET_TIMER + 1) % AGES] += ring[zero]
+        self._zero = (zero + 1) % AGES
+
+    def advance(self, days: int) -> Population:
+        """
+        Advances days days: one rotation per day for short spans, and a
+        matrix power for long ones. Returns self.
+        """
+        if days < MATRIX_DAYS:
+            for _ in range(days):
+                self.day()
+        else:
+            self._ring = advance_by_matrix(self.histogram(), days)
+            self._zero = 0
+        return self
+
+
+def count_fish(fish: Iterable[int], days: int) -> int:
+    """Returns the number of fish after days days."""
+    return Population.from_fish(fish).advance(days).total()
+
+
+class School:
+    """
+    A collection of LanternFish, kept as a Population so that days cost
+    the same however many fish there are. `fish` builds LanternFish
+    objects on request, one per fish.
+    """
+
+    def __init__(self, school_init: Iterable[int]):
+        self.population = Population.from_fish(school_init)
+
+    @property
+    def fish(self) -> List[LanternFish]:
+        return [
+            LanternFish(init_counter=timer)
+            for timer, count in enumerate(self.population.histogram())
+            for _ in range(count)
+        ]
+
+    def day(self) -> None:
+        self.population.day()
+
+    def days(self, days: int) -> None:
+        self.population.advance(days)
+
+    def count_fish(self) -> int:
+        return self.population.total()
+
+
+def part_1(input_file: str = input_location(day=6), days: int = 80) -> int:
+    """The number of lanternfish after days days."""
+    return count_fish(read_input(input_file), days)
+
+
+def part_2(input_file: str = input_location(day=6)) -> int:
+    """Part 1 after 256 days."""
+    return part_1(input_file, days=256)
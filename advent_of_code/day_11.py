@@ -0,0 +1,230 @@
+"""
+Advent of Code 2021 - Day 11: Dumbo Octopus
+https://adventofcode.com/2021/day/11
+
+The octopuses are an int8 grid of energy levels. A step adds one to
+every cell and then spreads flashes in waves, each wave adding a 3x3
+neighbour count of the octopuses that have just flashed.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Tuple
+import numpy as np
+from advent_of_code import metrics
+from advent_of_code.utils import input_location
+
+FLASH_LEVEL = 9  # an octopus above this flashes
+
+
+@dataclass(order=True, eq=True)
+class Octopus:
+    """
+    One octopus, as the notebook modelled them. engergy_level, the
+    notebook's spelling, is kept as an alias of energy_level.
+    """
+
+    row: int = field(default=0, compare=True)
+    col: int = field(default=0, compare=True)
+    energy_level: int = field(default=0, compare=False)
+    flashed_this_round: bool = field(default=False, compare=False, repr=False)
+
+    def increment_energy(self) -> bool:
+        """
+        Increments the energy level by 1, flashing (and returning True)
+        when it goes above 9. An octopus that flashed this round stays
+        at zero and does not flash again.
+        """
+        if self.flashed_this_round:
+            return False
+        if self.energy_level < FLASH_LEVEL:
+            self.energy_level += 1
+            return False
+        self.flashed_this_round = True
+        self.energy_level = 0
+        return True
+
+    @property
+    def engergy_level(self) -> int:
+        return self.energy_level
+
+    @engergy_level.setter
+    def engergy_level(self, level: int):
+        self.energy_level = level
+
+
+class OctopusGrid(object):
+    """
+    Energy levels as an int8 grid. An octopus gets at most 1 + 8 energy
+    in a step, so levels never pass 18. The boolean buffers a step needs
+    are allocated once.
+    """
+
+    def __init__(self, energy: np.ndarray):
+        self.energy = np.array(energy, dtype=np.int8)
+        if self.energy.ndim != 2:
+            raise ValueError("Energy levels must be a 2D grid.")
+        self._flashed = np.empty(self.energy.shape, dtype=bool)
+        self._new = np.empty(self.energy.shape, dtype=bool)
+        self._row_sums = np.empty(self.energy.shape, dtype=np.int8)
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str]) -> OctopusGrid:
+        rows = [line.strip() for line in lines if line.strip()]
+        return cls(np.array([[int(c) for c in row] for row in rows]))
+
+    @classmethod
+    def from_file(cls, input_file: str) -> OctopusGrid:
+        with open(input_file) as f:
+            return cls.from_lines(f)
+
+    @classmethod
+    def random(cls, shape: Tuple[int, int], seed: int = 0) -> OctopusGrid:
+        """A grid of uniformly random energy levels 0 .. 9."""
+        rng = np.random.default_rng(seed)
+        return cls(rng.integers(0, FLASH_LEVEL + 1, shape, dtype=np.int8))
+
+    def __repr__(self) -> str:
+        return "".join("".join(map(str, row)) + "\n" for row in self.energy)
+
+    @property
+    def size(self) -> int:
+        return self.energy.size
+
+    def _wave(self, lo: int, hi: int) -> Tuple[int, int]:
+        """
+        Adds to every octopus the number of its neighbours that have
+        just flashed (new, all in rows lo .. hi), then marks those that
+        flash in turn as new. The 3x3 count is a sum along the rows and
+        then down, so it includes the flasher itself, which is harmless
+        as it is reset to 0 at the end of the step.
+
+        Only rows lo - 1 .. hi + 1 can change, so the wave works on
+        those alone. Returns the rows holding the next new flashes, as
+        an empty range (lo > hi) when there are none.
+        """
+        energy, height = self.energy, self.energy.shape[0]
+        just = self._new[lo : hi + 1].view(np.int8)
+        sums = self._row_sums[lo : hi + 1]
+        np.copyto(sums, just)
+        sums[:, 1:] += just[:, :-1]
+        sums[:, :-1] += just[:, 1:]
+
+        energy[lo : hi + 1] += sums
+        above = max(lo - 1, 0)
+        energy[above:hi] += sums[above - lo + 1 :]
+        below = min(hi + 2, height)
+        energy[lo + 1 : below] += sums[: below - lo - 1]
+
+        over = energy[above:below] > FLASH_LEVEL
+        new = np.not_equal(
+            over, self._flashed[above:below], self._new[above:below]
+        )
+        self._flashed[above:below] |= new
+        rows = np.flatnonzero(new.any(axis=1))
+        if not len(rows):
+            return 0, -1
+        return above + int(rows[0]), above + int(rows[-1])
+
+    def step(self) -> int:
+        """Runs one step; returns how many octopuses flashed."""
+        energy = self.energy
+        energy += 1
+        new = np.greater(energy, FLASH_LEVEL, out=self._new)
+        np.copyto(self._flashed, new)
+        rows = np.flatnonzero(new.any(axis=1))
+        lo, hi = (int(rows[0]), int(rows[-1])) if len(rows) else (0, -1)
+        waves = 0
+        while lo <= hi:
+            lo, hi = self._wave(lo, hi)
+            waves += 1
+        flashes = int(np.count_nonzero(self._flashed))
+        if flashes:
+            # as int8, ~flashed would be -1/-2: multiply by not-flashed.
+            energy *= np.logical_not(self._flashed, out=self._new)
+        metrics.count("day_11.waves", waves)
+        return flashes
+
+    def count_flashes(self, steps: int) -> int:
+        """Runs steps steps; returns the total number of flashes."""
+        return sum(self.step() for _ in range(steps))
+
+    def steps_until_synchronized(self, max_steps: Optional[int] = None) -> int:
+        """
+        Steps until every octopus flashes at once and returns the number
+        of that step. Raises RuntimeError if that has not happened after
+        max_steps.
+        """
+        steps = 0
+        while max_steps is None or steps < max_steps:
+            steps += 1
+            if self.step() == self.size:
+                return steps
+        raise RuntimeError(f"Not synchronized after {max_steps} steps.")
+
+
+class Cave(object):
+    """
+    The notebook's Cave, stepped as an OctopusGrid. `grid` builds the
+    Octopus objects on request, and the notebook's one-octopus methods
+    work on the grid with a flashed-this-round flag per cell.
+    """
+
+    def __init__(self, input_file: str):
+        self.octopuses = OctopusGrid.from_file(input_file)
+        self._flashed = np.zeros(self.octopuses.energy.shape, dtype=bool)
+
+    def __repr__(self) -> str:
+        return repr(self.octopuses)
+
+    @property
+    def grid(self) -> List[List[Octopus]]:
+        return [
+            [
+                Octopus(r, c, int(level), bool(self._flashed[r, c]))
+                for c, level in enumerate(row)
+            ]
+            for r, row in enumerate(self.octopuses.energy)
+        ]
+
+    def increment_energy_level_at(self, row: int, col: int) -> Optional[bool]:
+        """
+        Increments the energy of the octopus at (row, col) as
+        Octopus.increment_energy does. Returns True if it just flashed,
+        and None if (row, col) is outside the cave.
+        """
+        height, width = self.octopuses.energy.shape
+        if not (0 <= row < height and 0 <= col < width):
+            return None
+        energy = self.octopuses.energy
+        if self._flashed[row, col]:
+            return False
+        if energy[row, col] < FLASH_LEVEL:
+            energy[row, col] += 1
+            return False
+        self._flashed[row, col] = True
+        energy[row, col] = 0
+        return True
+
+    def num_octopuses(self) -> int:
+        return self.octopuses.size
+
+    def reset_flashes(self) -> None:
+        """Clears every octopus's flashed-this-round flag."""
+        self._flashed[...] = False
+
+    def step(self) -> Tuple[int, bool]:
+        """Returns the flashes this step and whether every octopus did."""
+        flashes = self.octopuses.step()
+        self.reset_flashes()
+        return flashes, flashes == self.octopuses.size
+
+
+def part_1(input_file: str = input_location(day=11), steps: int = 100) -> int:
+    """Flashes in the first steps steps."""
+    return OctopusGrid.from_file(input_file).count_flashes(steps)
+
+
+def part_2(input_file: str = input_location(day=11)) -> int:
+    """The first step on which every octopus flashes."""
+    return OctopusGrid.from_file(input_file).steps_until_synchronized()
@@ -0,0 +1,147 @@
+"""
+Advent of Code 2021 - Day 12: Passage Pathing
+https://adventofcode.com/2021/day/12
+
+Caves are interned to small integers with int array adjacency. Paths
+are counted by memoising on (cave, small caves visited as a bitmask,
+whether the one revisit is still free), so no path is ever built.
+"""
+
+from __future__ import annotations
+from array import array
+from typing import Dict, Iterable, Iterator, List, Tuple
+from advent_of_code import metrics
+from advent_of_code.utils import input_location
+
+START, END = "start", "end"
+
+
+class CaveGraph(object):
+    """
+    The cave system with cave i named names[i]. adjacency[i] is an int
+    array of the caves joined to i, never including start, since no path
+    may go back there. Bit i of `small` is set for a small cave.
+    """
+
+    def __init__(self, names: List[str], adjacency: List[array]):
+        self.names = names
+        self.adjacency = adjacency
+        self.index = {name: i for i, name in enumerate(names)}
+        if START not in self.index or END not in self.index:
+            raise ValueError("The caves must include start and end.")
+        self.start = self.index[START]
+        self.end = self.index[END]
+        self.small = 0
+        for i, name in enumerate(names):
+            if name.islower():
+                self.small |= 1 << i
+        for i, joined in enumerate(adjacency):
+            for j in joined:
+                if not self.is_small(i) and not self.is_small(j):
+                    raise ValueError(
+                        f"Big caves {names[i]} and {names[j]} are joined, "
+                        "so there are infinitely many paths."
+                    )
+
+    @classmethod
+    def from_edges(cls, edges: Iterable[Tuple[str, str]]) -> CaveGraph:
+        index: Dict[str, int] = {}
+        joined: List[List[int]] = []
+
+        def intern(name: str) -> int:
+            if name not in index:
+                index[name] = len(index)
+                joined.append([])
+            return index[name]
+
+        for a, b in edges:
+            i, j = intern(a), intern(b)
+            if b != START:
+                joined[i].append(j)
+            if a != START:
+                joined[j].append(i)
+        names = sorted(index, key=index.get)
+        return cls(names, [array("i", sorted(set(x))) for x in joined])
+
+    @classmethod
+    def from_file(cls, filename: str) -> CaveGraph:
+        with open(filename) as f:
+            return cls.from_edges(
+                tuple(line.strip().split("-")) for line in f if line.strip()
+            )
+
+    def is_small(self, cave: int) -> bool:
+        return bool(self.small >> cave & 1)
+
+    def count_paths(self, allow_revisit: bool = False) -> int:
+        """
+        Returns the number of paths from start to end visiting each small
+        cave at most once, or, with allow_revisit, one small cave (not
+        start or end) twice.
+
+        The paths onward from a cave depend only on which small caves
+        have been seen and whether the revisit is used, so each such
+        state is counted once. There are at most caves x 2^small x 2
+        states, however many paths there are.
+        """
+        adjacency, small, end = self.adjacency, self.small, self.end
+        memo: Dict[Tuple[int, int, bool], int] = {}
+
+        def count(cave: int, seen: int, revisit: bool) -> int:
+            key = (cave, seen, revisit)
+            if key in memo:
+                return memo[key]
+            total = 0
+            for n in adjacency[cave]:
+                if n == end:
+                    total += 1
+                elif not seen >> n & 1:
+                    total += count(n, seen | (small & 1 << n), revisit)
+                elif revisit:
+                    total += count(n, seen, False)
+            memo[key] = total
+            return total
+
+        start = self.start
+        total = count(start, small & 1 << start, allow_revisit)
+        metrics.count("day_12.states", len(memo))
+        return total
+
+    def iter_paths(self, allow_revisit: bool = False) -> Iterator[List[str]]:
+        """
+        Lazily yields every path counted by count_paths as a list of cave
+        names. The walk is depth first with an explicit stack of
+        neighbour positions, so memory is one path, not all of them.
+        """
+        adjacency, small, end = self.adjacency, self.small, self.end
+        path = [self.start]
+        # per cave on the path: the next neighbour to try, the seen mask
+        # and whether the revisit is still free on arriving there.
+        stack = [(0, small & 1 << self.start, allow_revisit)]
+        while stack:
+            position, seen, revisit = stack[-1]
+            joined = adjacency[path[-1]]
+            if position == len(joined):
+                stack.pop()
+                path.pop()
+                continue
+            stack[-1] = (position + 1, seen, revisit)
+            n = joined[position]
+            if n == end:
+                yield [self.names[cave] for cave in path] + [END]
+            elif not seen >> n & 1:
+                path.append(n)
+                stack.append((0, seen | (small & 1 << n), revisit))
+            elif revisit:
+                path.append(n)
+                stack.append((0, seen, False))
+
+
+def part_1(filename: str = input_location(day=12)) -> int:
+    """Paths visiting small caves at most once."""
+    return CaveGraph.from_file(filename).count_paths()
+
+
+def part_2(filename: str = input_location(day=12)) -> int:
+    """Paths that may visit a single small cave twice."""
+    return CaveGraph.from_file(filename).count_paths(allow_revisit=True)
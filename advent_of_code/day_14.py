@@ -5,18 +5,52 @@ https://adventofcode.com/2021/day/14
 """
 
 import collections
+from collections import Counter
+from types import MappingProxyType
+from typing import Mapping, Tuple
+import weakref
+import numpy as np
+from advent_of_code.utils import input_location
 
 
 class FrozenDict(collections.abc.Mapping):
     """
-    A barebones hashable dictionary class.  This is not complete
-    in that it is not actually immutable, but it gives us the 
-    functionality required to use it to answer this question.
+    An immutable, hashable dictionary. The contents are held in a
+    read-only mapping proxy, attributes cannot be set after
+    construction, and the hash is computed once up front, so using one
+    as a key of a @cache'd function costs a single pointer comparison
+    when the same instance is passed again.
+
+    FrozenDict.intern(...) returns a shared instance for equal contents,
+    so memoized calls made with equal rule sets hit by identity too.
     """
 
+    __slots__ = ("_d", "_hash", "__weakref__")
+    _interned: "weakref.WeakValueDictionary" = weakref.WeakValueDictionary()
+
     def __init__(self, *args, **kwargs):
-        self._d = dict(*args, **kwargs)
-        self._hash = None
+        d = dict(*args, **kwargs)
+        object.__setattr__(self, "_d", MappingProxyType(d))
+        object.__setattr__(self, "_hash", hash(frozenset(d.items())))
+
+    @classmethod
+    def intern(cls, *args, **kwargs) -> "FrozenDict":
+        """Returns the shared FrozenDict with these contents."""
+        candidate = cls(*args, **kwargs)
+        key = frozenset(candidate._d.items())
+        return cls._interned.setdefault(key, candidate)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable.")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable.")
+
+    def __reduce__(self):
+        return (type(self), (dict(self._d),))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self._d)!r})"
 
     def __iter__(self):
         return iter(self._d)
@@ -27,10 +61,130 @@ class FrozenDict(collections.abc.Mapping):
     def __getitem__(self, key):
         return self._d[key]
 
+    def __eq__(self, other):
+        if other is self:
+            return True
+        if isinstance(other, FrozenDict):
+            return self._hash == other._hash and self._d == other._d
+        if isinstance(other, collections.abc.Mapping):
+            return self._d == dict(other.items())
+        return NotImplemented
+
     def __hash__(self):
-        if self._hash is None:
-            hash_ = 0
-            for pair in self.items():
-                hash_ ^= hash(pair)
-            self._hash = hash_
-        return self._hash
\ No newline at end of file
+        return self._hash
+
+
+def read_input(input_file: str) -> Tuple[str, dict]:
+    """
+    Parse input file into polymer template name (str)
+    and rules (dict) with the form k:v->element pair:element
+    """
+    polymer: str = None
+    rules: dict = {}  # k:v -> element pair:element
+
+    with open(input_file) as f:
+        for line in f:
+            if line.rstrip() and "->" not in line:
+                polymer = line.rstrip()
+
+            elif line.rstrip() and "->" in line:
+                pair, insertion = line.rstrip().split(" -> ")
+                rules[pair] = insertion
+
+    return polymer, rules
+
+
+class PairTransitions(object):
+    """
+    The pair insertion rules as a matrix over every pair of elements.
+    Column j of the matrix holds the pairs that pair j becomes after
+    one step (AB -> C makes AC and CB; a pair with no rule stays put),
+    so n steps are the matrix raised to the n-th power, which repeated
+    squaring reaches in O(P^3 log n) for P pairs.
+    """
+
+    def __init__(self, rules: Mapping[str, str], elements: str = ""):
+        self.rules = dict(rules)
+        self.elements = sorted(
+            set("".join(self.rules)) | set(self.rules.values()) | set(elements)
+        )
+        self.pairs = [a + b for a in self.elements for b in self.elements]
+        self.index = {pair: i for i, pair in enumerate(self.pairs)}
+
+        size = len(self.pairs)
+        self.matrix = np.zeros((size, size), dtype=object)
+        for pair, j in self.index.items():
+            insertion = self.rules.get(pair)
+            if insertion is None:
+                self.matrix[j, j] += 1
+            else:
+                self.matrix[self.index[pair[0] + insertion], j] += 1
+                self.matrix[self.index[insertion + pair[1]], j] += 1
+
+    def power(self, steps: int, dtype=object) -> np.ndarray:
+        """Returns the transition matrix for the given number of steps."""
+        result = np.identity(len(self.pairs), dtype=dtype)
+        square = self.matrix.astype(dtype)
+        while steps:
+            if steps & 1:
+                result = result @ square
+            steps >>= 1
+            if steps:
+                square = square @ square
+        return result
+
+    def advance(self, pair_counts: np.ndarray, steps: int) -> np.ndarray:
+        """
+        Returns the pair counts after steps. Same squaring as power, but
+        the counts are carried along as a vector. A squaring costs as
+        much as P matrix-vector products, so once fewer than P
+        applications of the current square remain they are applied one
+        by one, which also skips the widest (most expensive) squarings.
+        """
+        square = self.matrix.astype(pair_counts.dtype)
+        while steps >= len(self.pairs):
+            if steps & 1:
+                pair_counts = square @ pair_counts
+            steps >>= 1
+            square = square @ square
+        for _ in range(steps):
+            pair_counts = square @ pair_counts
+        return pair_counts
+
+    def element_counts(self, polymer: str, steps: int) -> Counter:
+        """
+        Returns the Counter of elements in the polymer after steps.
+        Counts fit uint64 while (len(polymer) - 1) * 2 ** steps does,
+        and the matrix work is done in uint64 then; larger step counts
+        use exact Python integers.
+        """
+        if not set(polymer) <= set(self.elements):
+            return PairTransitions(self.rules, polymer).element_counts(
+                polymer, steps
+            )
+        fits_uint64 = (len(polymer) - 1) << steps < 1 << 64
+        dtype = np.uint64 if fits_uint64 else object
+
+        pair_counts = np.zeros(len(self.pairs), dtype=dtype)
+        for a, b in zip(polymer, polymer[1:]):
+            pair_counts[self.index[a + b]] += 1
+        pair_counts = self.advance(pair_counts, steps)
+
+        # every element starts one pair, except the last in the polymer.
+        counts = Counter({polymer[-1]: 1})
+        for pair, count in zip(self.pairs, pair_counts.tolist()):
+            if count:
+                counts[pair[0]] += int(count)
+        return counts
+
+
+def part_1(input_file: str = input_location(day=14), steps: int = 10) -> int:
+    """Most common minus least common element after steps."""
+    polymer, rules = read_input(input_file)
+    counts = PairTransitions(rules).element_counts(polymer, steps).values()
+    return max(counts) - min(counts)
+
+
+def part_2(input_file: str = input_location(day=14)) -> int:
+    """Part 1 after 40 steps."""
+    return part_1(input_file, steps=40)
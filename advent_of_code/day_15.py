@@ -0,0 +1,200 @@
+"""
+Advent of Code 2021 - Day 15: Chiton
+https://adventofcode.com/2021/day/15
+
+Lowest total risk paths through a cave of risk levels, searched on the
+numpy risk array itself rather than a graph of per-cell nodes.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+import numpy as np
+from advent_of_code import metrics
+from advent_of_code.utils import input_location, parse_digit_grid
+
+# predecessor codes: the step taken to reach a cell. 0 marks the start.
+_UP, _DOWN, _LEFT, _RIGHT = 1, 2, 3, 4
+
+
+def read_cave(filename: str) -> np.ndarray:
+    """Reads a cave of risk levels as a uint8 array."""
+    with open(filename, "rb") as f:
+        return parse_digit_grid(f.read())
+
+
+class TiledCave(object):
+    """
+    A cave repeated factor times across and down, each tile's risks one
+    higher than the tile to its left or above, wrapping 9 back round to
+    1. Risks are worked out from the index on demand, so the full cave
+    is never built.
+    """
+
+    def __init__(self, risk: np.ndarray, factor: int = 1):
+        self.risk = np.asarray(risk, dtype=np.uint8)
+        self.factor = factor
+        self.tile_shape = self.risk.shape
+        self.shape = (
+            self.tile_shape[0] * factor,
+            self.tile_shape[1] * factor,
+        )
+        self.size = self.shape[0] * self.shape[1]
+        # per row/column: the index within the tile and the tile number,
+        # and the wrapped risk for every base risk plus tile numbers.
+        rows, cols = np.arange(self.shape[0]), np.arange(self.shape[1])
+        self._row_in_tile = rows % self.tile_shape[0]
+        self._row_tile = rows // self.tile_shape[0]
+        self._col_in_tile = cols % self.tile_shape[1]
+        self._col_tile = cols // self.tile_shape[1]
+        self._wrap = (np.arange(10 + 2 * factor) - 1) % 9 + 1
+
+    def risk_rc(self, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        """Returns the risk at arrays of row and column indices."""
+        if self.factor == 1:
+            return self.risk[rows, cols]
+        return self._wrap[
+            self.risk[self._row_in_tile[rows], self._col_in_tile[cols]]
+            + self._row_tile[rows]
+            + self._col_tile[cols]
+        ]
+
+    def risk_at(self, cells: np.ndarray) -> np.ndarray:
+        """Returns the risk at an array of flat (row-major) indices."""
+        rows, cols = np.divmod(cells, self.shape[1])
+        return self.risk_rc(rows, cols)
+
+    def expand(self) -> np.ndarray:
+        """Builds the full tiled cave (for inspection; search is virtual)."""
+        cells = np.arange(self.size, dtype=np.int64)
+        return self.risk_at(cells).astype(np.uint8).reshape(self.shape)
+
+
+@dataclass(frozen=True)
+class PathResult:
+    """
+    The lowest total risk from start to end (the start's own risk is
+    not counted) and, if asked for, the cells on the way as (row, col).
+    """
+
+    cost: int
+    path: Optional[List[Tuple[int, int]]] = None
+
+
+def _neighbours(cells: np.ndarray, shape: Tuple[int, int]):
+    """
+    Yields (code, neighbour indices, neighbour rows, neighbour columns)
+    for each step that stays inside the cave.
+    """
+    height, width = shape
+    rows, cols = np.divmod(cells, width)
+    for code, inside, step, d_row, d_col in (
+        (_UP, rows > 0, -width, -1, 0),
+        (_DOWN, rows < height - 1, width, 1, 0),
+        (_LEFT, cols > 0, -1, 0, -1),
+        (_RIGHT, cols < width - 1, 1, 0, 1),
+    ):
+        yield (
+            code,
+            cells[inside] + step,
+            rows[inside] + d_row,
+            cols[inside] + d_col,
+        )
+
+
+def _trace(
+    came_from: np.ndarray, end: int, width: int
+) -> List[Tuple[int, int]]:
+    """Walks the predecessor codes back from end to the start."""
+    back = {_UP: width, _DOWN: -width, _LEFT: 1, _RIGHT: -1}
+    path = [end]
+    while came_from[path[-1]]:
+        path.append(path[-1] + back[int(came_from[path[-1]])])
+    return [divmod(cell, width) for cell in reversed(path)]
+
+
+def lowest_risk_path(
+    risk: np.ndarray,
+    factor: int = 1,
+    start: Tuple[int, int] = (0, 0),
+    end: Optional[Tuple[int, int]] = None,
+    with_path: bool = False,
+) -> PathResult:
+    """
+    Finds the lowest total risk from start to end (the bottom right by
+    default) of the cave tiled factor times.
+
+    This is Dijkstra's algorithm with a bucket queue (Dial's algorithm),
+    with every cell of the current bucket settled at once: each round
+    takes the cells at distance d and relaxes their neighbours one
+    direction at a time as numpy array operations. Risks are at most 9,
+    so only the ten buckets d .. d + 9 are ever live and they are kept
+    in a ring. Memory is a distance and a uint8 predecessor code per
+    cell, plus the live buckets.
+    """
+    cave = TiledCave(risk, factor)
+    width = cave.shape[1]
+    first = start[0] * width + start[1]
+    last = cave.size - 1 if end is None else end[0] * width + end[1]
+
+    dtype = np.int32 if 9 * cave.size < np.iinfo(np.int32).max else np.int64
+    dist = np.full(cave.size, np.iinfo(dtype).max, dtype=dtype)
+    came_from = np.zeros(cave.size, dtype=np.uint8) if with_path else None
+    dist[first] = 0
+    # buckets[v % 10] holds the cells last given tentative distance v.
+    buckets: List[List[np.ndarray]] = [[] for _ in range(10)]
+    buckets[0].append(np.array([first], dtype=np.int64))
+    waiting, d, rounds = 1, 0, 0
+
+    while waiting and dist[last] > d:
+        bucket = buckets[d % 10]
+        if not bucket:
+            d += 1
+            continue
+        rounds += 1
+        cells = np.concatenate(bucket)
+        bucket.clear()
+        waiting -= len(cells)
+        # drop cells that have since been given a lower distance. A
+        # cell only ever moves to lower buckets, so none is here twice.
+        frontier = cells[dist[cells] == d]
+
+        reached, costs = [], []
+        for code, neighbours, rows, cols in _neighbours(frontier, cave.shape):
+            candidate = d + cave.risk_rc(rows, cols).astype(dtype)
+            better = candidate < dist[neighbours]
+            neighbours, candidate = neighbours[better], candidate[better]
+            dist[neighbours] = candidate
+            if with_path:
+                came_from[neighbours] = code
+            reached.append(neighbours)
+            costs.append(candidate)
+
+        reached, costs = np.concatenate(reached), np.concatenate(costs)
+        order = np.argsort(costs, kind="stable")
+        reached, costs = reached[order], costs[order]
+        bounds = np.searchsorted(costs, np.arange(d + 1, d + 10), "right")
+        lo = 0
+        for value, hi in enumerate(bounds.tolist(), start=d + 1):
+            if hi > lo:
+                buckets[value % 10].append(reached[lo:hi])
+            lo = hi
+        waiting += len(reached)
+        d += 1
+
+    metrics.count("day_15.rounds", rounds)
+    cost = int(dist[last])
+    if cost == np.iinfo(dtype).max:
+        raise ValueError(f"No path from {start} to {end}.")
+    path = _trace(came_from, last, width) if with_path else None
+    return PathResult(cost, path)
+
+
+def part_1(filename: str = input_location(day=15)) -> int:
+    """Lowest total risk across the cave."""
+    return lowest_risk_path(read_cave(filename)).cost
+
+
+def part_2(filename: str = input_location(day=15)) -> int:
+    """Lowest total risk across the cave tiled five times each way."""
+    return lowest_risk_path(read_cave(filename), factor=5).cost
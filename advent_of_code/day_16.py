@@ -1,9 +1,17 @@
 """
 Classes for managing Day 16 packet seperating.
 """
-from dataclasses import dataclass, InitVar, field
-from typing import Optional
-from advent_of_code import utils
+
+from __future__ import annotations
+from array import array
+from dataclasses import dataclass, field
+from enum import Enum
+from functools import lru_cache
+from typing import Iterator, Optional, Union
+import math
+import operator
+from advent_of_code import metrics, utils
+from advent_of_code.utils import BitCursor, HexStreamReader
 
 
 class InvalidPacketError(Exception):
@@ -60,32 +68,68 @@ class OperatorPacketInfo:
 
 
 class Packet(object):
-    """Base Packet class"""
+    """
+    Base Packet class.
+
+    A packet can be built from a '0'/'1' string (the original interface)
+    or from a BitCursor positioned at the start of the packet. Either
+    way the bits are read through the cursor, so sub-packets never copy
+    the transmission; each packet only records where its bits start and
+    end and the cursor is left just past the packet.
+    """
 
-    binary_data: InitVar[str]
     header: PacketHeader
-    data_bits: str
     operator_info: Optional[OperatorPacketInfo] = field(default=None)
 
-    def __new__(cls, binary_data: str):
-        if utils.bin_to_dec(binary_data[3:6]) == 4:
+    def __new__(cls, binary_data: Union[str, BitCursor]):
+        if isinstance(binary_data, BitCursor):
+            type_id = binary_data.peek(3, offset=3)
+        else:
+            type_id = utils.bin_to_dec(binary_data[3:6])
+        if type_id == 4:
             return object.__new__(LiteralPacket)
         else:
             return object.__new__(OperatorPacket)
 
-    def __init__(self, binary_data):
+    def __init__(self, binary_data: Union[str, BitCursor]):
         """Creates a very basic packet."""
-        if len(binary_data) < 11:
+        cursor = (
+            binary_data
+            if isinstance(binary_data, BitCursor)
+            else BitCursor.from_bits(binary_data)
+        )
+        if cursor.remaining() < 11:
             raise InvalidPacketError("Binary data is too small.")
 
         # create standard packet.
+        metrics.count("day_16.packets")
+        self._cursor = cursor
+        self._start = cursor.pos
         self.header = PacketHeader(
-            utils.bin_to_dec(binary_data[0:3]),  # version
-            utils.bin_to_dec(binary_data[3:6]),  # type_id
+            cursor.read(3),  # version
+            cursor.read(3),  # type_id
         )
-        self.data_bits = ""
+        self._end = cursor.pos
         self.operator_info = None
 
+    @classmethod
+    def from_hex(cls, hex: str) -> Packet:
+        """Parses the packet at the start of a hexidecimal transmission."""
+        return Packet(BitCursor.from_hex(hex))
+
+    @classmethod
+    def from_buffer(cls, buf) -> Packet:
+        """Parses the packet at the start of a bytes-like transmission."""
+        return Packet(BitCursor(buf))
+
+    @property
+    def data_bits(self) -> str:
+        """The packet's payload bits, rendered on demand."""
+        data_start = self._start + self.header.length()
+        if self.operator_info is not None:
+            data_start += self.operator_info.length()
+        return self._cursor.bits(data_start, self._end)
+
     def sum_of_version_numbers(self) -> int:
         """
         Returns the version number. Additionally, if this is an OperatorPacket,
@@ -103,15 +147,15 @@ class Packet(object):
         Returns the packet length (header, data, and optional operator
         information)
         """
-        return (
-            self.header.length()
-            + len(self.data_bits)
-            + (
-                self.operator_info.length()
-                if self.operator_info is not None
-                else 0
-            )
-        )
+        return self._end - self._start
+
+    def compile(self) -> PacketProgram:
+        """Returns this packet tree as a postfix PacketProgram."""
+        return compile_packet(self)
+
+    def evaluate(self) -> int:
+        """Returns the value of the expression this packet encodes."""
+        return compile_packet(self).evaluate()
 
 
 class LiteralPacket(Packet):
@@ -119,27 +163,27 @@ class LiteralPacket(Packet):
 
     value: str
 
-    def __init__(self, binary_data: str):
+    def __init__(self, binary_data: Union[str, BitCursor]):
         super(LiteralPacket, self).__init__(binary_data)
         if self.header.type_id != 4:
             raise ValueError(
                 "A packet with a type != 4 cannot be a LiteralPacket."
             )
 
-        self.data_bits = binary_data[6:]
-        self.value = self.parse()
-        # print(f"Found: {self}")
+        self.value = self.parse(self._cursor)
+        self._end = self._cursor.pos
 
     def __repr__(self) -> str:
         return (
             f"{self.__class__.__name__}(version={self.header.version}, "
             f"type_id={self.header.type_id}, value={self.value}, "
-            f"bits_len={len(self.data_bits)}, bits={self.data_bits})"
+            f"bits_len={self.length() - self.header.length()}, "
+            f"bits={self.data_bits})"
         )
 
-    def parse(self, byte_length=5) -> str:
+    def parse(self, cursor: BitCursor, byte_length=5) -> str:
         """
-        Converts binary_data into the value string using this logic:
+        Reads the value from the cursor using this logic:
 
             Packets with type ID 4 represent a literal value. Literal
             value packets encode a single binary number. To do this,
@@ -148,27 +192,18 @@ class LiteralPacket(Packet):
             into groups of four bits. Each group is prefixed by a 1
             bit except the last group, which is prefixed by a 0 bit.
 
-        Sets the parsed value binary to string representation of
-        value to self.value.
-        Returns:None
+        Returns the string representation of the value.
         """
-        bytes: list[str] = [
-            self.data_bits[idx:idx+byte_length]
-            for idx in range(0, len(self.data_bits), 5)
-            if idx + 5 <= len(self.data_bits)
-        ]
-
-        actual_bits = ""
-        for byte in bytes:
-            actual_bits += byte
-            if byte[0] == "0":
+        group_mask = (1 << (byte_length - 1)) - 1
+        value = 0
+        while cursor.remaining() >= byte_length:
+            group = cursor.read(byte_length)
+            value = (value << (byte_length - 1)) | (group & group_mask)
+            if not group >> (byte_length - 1):
                 break
+        return str(value)
 
-        # set object properties
-        self.data_bits = actual_bits
-        return self.compute_value_from_bits()
-
-    def compute_value_from_bits(self, byte_length=5) -> int:
+    def compute_value_from_bits(self, byte_length=5) -> str:
         """Returns the value of the bytes when combined."""
         valid_bits = "".join(
             [x for idx, x in enumerate(self.data_bits) if idx % byte_length]
@@ -181,47 +216,47 @@ class OperatorPacket(Packet):
 
     sub_packets: list[Packet] = field(default_factory=list())
 
-    def __init__(self, binary_data: str):
+    def __init__(self, binary_data: Union[str, BitCursor]):
         super(OperatorPacket, self).__init__(binary_data)
 
+        cursor = self._cursor
         if self.header.type_id == 4:
             raise InvalidPacketError("Invalid binary for OperatorPacket.")
         else:
+            length_type_id = cursor.read(1)
+            size_width = 15 if length_type_id == 0 else 11
+            if cursor.remaining() < size_width:
+                raise InvalidPacketError("Binary data is too small.")
             self.operator_info = OperatorPacketInfo(
-                int(binary_data[6]),  # op type
+                length_type_id,  # op type
                 # data length info
-                binary_data[7:22]
-                if int(binary_data[6]) == 0
-                else binary_data[7:18],
+                format(cursor.read(size_width), f"0{size_width}b"),
             )
 
-        data_bits_idx_start = (
-            self.header.length() + self.operator_info.length()
-        )
-        self.data_bits = binary_data[data_bits_idx_start:]
         self.sub_packets = []
+        data_size = utils.bin_to_dec(self.operator_info.data_size_bits)
 
         if self.operator_info.length_type_id == 0:
-            if utils.bin_to_dec(binary_data[7:22]) > len(self.data_bits):
+            if data_size > cursor.remaining():
                 raise InvalidPacketError(
                     "Expected data size: "
-                    f"{utils.bin_to_dec(binary_data[7:22])} "
-                    f"found {len(self.data_bits)}"
+                    f"{data_size} "
+                    f"found {cursor.remaining()}"
                 )
-            self.parse_data_typ0()
+            self.parse_data_typ0(cursor)
         elif self.operator_info.length_type_id == 1:
-            if utils.bin_to_dec(binary_data[7:18]) * 11 > len(self.data_bits):
+            if data_size * 11 > cursor.remaining():
                 raise InvalidPacketError(
                     "Expected data size > "
-                    "{utils.bin_to_dec(binary_data[7:18])*11} "
-                    f"found {len(self.data_bits)}"
+                    f"{data_size * 11} "
+                    f"found {cursor.remaining()}"
                 )
-            self.parse_data_typ1()
+            self.parse_data_typ1(cursor)
         else:
             raise NotImplementedError(
                 "No handling for operator type not in [0,1]"
             )
-        # print(f"Found: {self}")
+        self._end = cursor.pos
 
     def __repr__(self) -> str:
         pval = (
@@ -236,34 +271,40 @@ class OperatorPacket(Packet):
             pval = pval + f"\n\t -> {subp}"
         return pval
 
-    def parse_data_typ0(self):
+    def parse_data_typ0(self, cursor: BitCursor):
         """
-        Converts binary_data into the value string using this logic:
+        Reads sub-packets from the cursor using this logic:
 
             If the length type ID is 0, then the next 15 bits are a
             number that represents the total length in bits of the
             sub-packets contained by this packet.
+
+        The cursor is left at the end of the declared data.
         """
         # we know the size of packet because it is stored in the header
-        packet_data_size = utils.bin_to_dec(self.operator_info.data_size_bits)
-        self.data_bits = self.data_bits[:packet_data_size]
-
-        remaining_bits = self.data_bits[:]  # copy it.
-        while packet_data_size > 0 and len(remaining_bits) >= 11:
-            try:
-                sub_packet = Packet(remaining_bits)
-            except InvalidPacketError as err:
-                print(remaining_bits)
-                print(err.message)
-                return
-
-            self.sub_packets.append(sub_packet)
-            remaining_bits = remaining_bits[sub_packet.length():]
-            packet_data_size = packet_data_size - sub_packet.length()
-
-    def parse_data_typ1(self):
+        data_end = cursor.pos + utils.bin_to_dec(
+            self.operator_info.data_size_bits
+        )
+        # sub-packets may not read past the declared data.
+        bit_length, cursor.bit_length = cursor.bit_length, data_end
+        try:
+            while cursor.remaining() >= 11:
+                sub_start = cursor.pos
+                try:
+                    sub_packet = Packet(cursor)
+                except (InvalidPacketError, EOFError) as err:
+                    print(getattr(err, "message", err))
+                    cursor.pos = sub_start
+                    break
+
+                self.sub_packets.append(sub_packet)
+        finally:
+            cursor.bit_length = bit_length
+        cursor.pos = data_end
+
+    def parse_data_typ1(self, cursor: BitCursor):
         """
-        Converts binary_data into the value string using this logic:
+        Reads sub-packets from the cursor using this logic:
 
             If the length type ID is 1, then the next 11 bits are a
             number that represents the number of sub-packets immediately
@@ -275,20 +316,303 @@ class OperatorPacket(Packet):
         sub_packet_counter = utils.bin_to_dec(
             self.operator_info.data_size_bits
         )
-        remaining_bits = self.data_bits[:]
-        valid_bit_counter = 0
-        while sub_packet_counter > 0 and len(remaining_bits) >= 11:
-            # print(f"sub packet counter: {sub_packet_counter}")
+        while sub_packet_counter > 0 and cursor.remaining() >= 11:
+            sub_start = cursor.pos
             try:
-                sub_packet = Packet(remaining_bits)
-            except InvalidPacketError as err:
-                print(remaining_bits)
-                print(err.message)
+                sub_packet = Packet(cursor)
+            except (InvalidPacketError, EOFError) as err:
+                print(getattr(err, "message", err))
+                cursor.pos = sub_start
                 break
 
             self.sub_packets.append(sub_packet)
-            valid_bit_counter = valid_bit_counter + sub_packet.length()
-            remaining_bits = remaining_bits[sub_packet.length():]
             sub_packet_counter = sub_packet_counter - 1
 
-        self.data_bits = self.data_bits[:valid_bit_counter]
+
+class EventKind(Enum):
+    """The kinds of event produced by iter_packet_events."""
+
+    HEADER = "header"
+    LITERAL = "literal"
+    OPERATOR_BEGIN = "operator_begin"
+    OPERATOR_END = "operator_end"
+
+
+@dataclass(frozen=True)
+class PacketEvent:
+    """
+    A single parse event. `value` holds the literal's value for LITERAL
+    events and is None otherwise.
+    """
+
+    kind: EventKind
+    version: int
+    type_id: int
+    value: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class StreamResult:
+    """What evaluate_stream found in a transmission."""
+
+    version_sum: int
+    value: int
+
+
+def iter_packet_events(
+    reader: Union[BitCursor, HexStreamReader],
+) -> Iterator[PacketEvent]:
+    """
+    Parses the outermost packet from `reader` without recursion.
+
+    Every packet yields a HEADER event followed by either a LITERAL
+    event or an OPERATOR_BEGIN event; operators are closed with an
+    OPERATOR_END event once all of their sub-packets have been read.
+    Open operators are kept on an explicit stack of
+    [version, type_id, length_type_id, limit] frames, where limit is the
+    reader position the data ends at (length type 0) or the number of
+    sub-packets still to read (length type 1).
+    """
+    stack: list[list[int]] = []
+    packets = 0
+    while True:
+        version = reader.read(3)
+        type_id = reader.read(3)
+        packets += 1
+        yield PacketEvent(EventKind.HEADER, version, type_id)
+
+        if type_id == 4:
+            value = 0
+            group = 0x10
+            while group & 0x10:
+                group = reader.read(5)
+                value = (value << 4) | (group & 0xF)
+            yield PacketEvent(EventKind.LITERAL, version, type_id, value)
+            if stack and stack[-1][2] == 1:
+                stack[-1][3] -= 1
+        else:
+            length_type_id = reader.read(1)
+            if length_type_id == 0:
+                size = reader.read(15)
+                limit = reader.pos + size
+            else:
+                limit = reader.read(11)
+            yield PacketEvent(EventKind.OPERATOR_BEGIN, version, type_id)
+            stack.append([version, type_id, length_type_id, limit])
+
+        # close every operator whose sub-packets are all read.
+        while stack and (
+            stack[-1][3] <= reader.pos
+            if stack[-1][2] == 0
+            else stack[-1][3] <= 0
+        ):
+            version, type_id, _, _ = stack.pop()
+            yield PacketEvent(EventKind.OPERATOR_END, version, type_id)
+            if stack and stack[-1][2] == 1:
+                stack[-1][3] -= 1
+
+        if not stack:
+            metrics.count("day_16.packets", packets)
+            return
+
+
+# binary operations for each operator type_id, applied left to right.
+OPERATIONS = {
+    0: operator.add,
+    1: operator.mul,
+    2: min,
+    3: max,
+    5: lambda a, b: int(a > b),
+    6: lambda a, b: int(a < b),
+    7: lambda a, b: int(a == b),
+}
+
+
+def _fold(type_id: int, acc: Optional[int], value: int) -> int:
+    """Folds a sub-packet value into an operator's running value."""
+    if acc is None:
+        return value
+    try:
+        return OPERATIONS[type_id](acc, value)
+    except KeyError:
+        raise InvalidPacketError(f"Unknown operator type {type_id}.")
+
+
+def evaluate_stream(reader: Union[BitCursor, HexStreamReader]) -> StreamResult:
+    """
+    Computes the version sum and the value of the outermost packet from
+    the event stream. Each open operator keeps only its running value,
+    so memory is proportional to the nesting depth.
+    """
+    version_sum = 0
+    accumulators: list[list] = []  # [type_id, running value]
+    result = None
+    for event in iter_packet_events(reader):
+        if event.kind is EventKind.HEADER:
+            version_sum += event.version
+            continue
+        if event.kind is EventKind.OPERATOR_BEGIN:
+            accumulators.append([event.type_id, None])
+            continue
+
+        if event.kind is EventKind.LITERAL:
+            value = event.value
+        else:
+            type_id, value = accumulators.pop()
+            if value is None:
+                raise InvalidPacketError("Operator without sub-packets.")
+
+        if accumulators:
+            parent = accumulators[-1]
+            parent[1] = _fold(parent[0], parent[1], value)
+        else:
+            result = value
+    return StreamResult(version_sum, result)
+
+
+def evaluate_file(filename: str, chunk_size: int = 1 << 16) -> StreamResult:
+    """Streams a hexidecimal transmission from disk through evaluate_stream."""
+    with open(filename) as f:
+        return evaluate_stream(HexStreamReader(f, chunk_size))
+
+
+# n-ary form of OPERATIONS, used when all operands are on hand.
+REDUCERS = {
+    0: sum,
+    1: math.prod,
+    2: min,
+    3: max,
+    5: lambda args: int(args[0] > args[1]),
+    6: lambda args: int(args[0] < args[1]),
+    7: lambda args: int(args[0] == args[1]),
+}
+
+# opcodes beyond the operator type_ids. A literal is pushed with its own
+# type_id (4); literals too wide for the operand array use PUSH_CONST.
+PUSH = 4
+PUSH_CONST = 8
+_OPERAND_MAX = (1 << 64) - 1
+
+
+@dataclass(frozen=True)
+class PacketProgram:
+    """
+    A packet tree flattened into postfix order. opcodes[i] is PUSH,
+    PUSH_CONST or an operator type_id; operands[i] is the literal value,
+    the index into constants, or the operator's argument count.
+    """
+
+    opcodes: array
+    operands: array
+    constants: tuple = ()
+
+    def __len__(self) -> int:
+        return len(self.opcodes)
+
+    def evaluate(self) -> int:
+        """Runs the program on a value stack and returns the result."""
+        stack: list[int] = []
+        push = stack.append
+        constants = self.constants
+        for opcode, operand in zip(self.opcodes, self.operands):
+            if opcode == PUSH:
+                push(operand)
+            elif opcode == PUSH_CONST:
+                push(constants[operand])
+            else:
+                args = stack[-operand:]
+                del stack[-operand:]
+                push(REDUCERS[opcode](args))
+        return stack[0]
+
+
+class _ProgramBuilder(object):
+    """Collects instructions for a PacketProgram."""
+
+    def __init__(self):
+        self.opcodes = array("B")
+        self.operands = array("Q")
+        self.constants: list[int] = []
+
+    def literal(self, value: int):
+        if value > _OPERAND_MAX:
+            self.opcodes.append(PUSH_CONST)
+            self.operands.append(len(self.constants))
+            self.constants.append(value)
+        else:
+            self.opcodes.append(PUSH)
+            self.operands.append(value)
+
+    def operator(self, type_id: int, argc: int):
+        if type_id not in REDUCERS:
+            raise InvalidPacketError(f"Unknown operator type {type_id}.")
+        if argc == 0:
+            raise InvalidPacketError("Operator without sub-packets.")
+        self.opcodes.append(type_id)
+        self.operands.append(argc)
+
+    def build(self) -> PacketProgram:
+        return PacketProgram(
+            self.opcodes, self.operands, tuple(self.constants)
+        )
+
+
+def compile_packet(packet: Packet) -> PacketProgram:
+    """Flattens a Packet tree into a PacketProgram without recursion."""
+    builder = _ProgramBuilder()
+    stack = [(packet, False)]
+    while stack:
+        node, children_done = stack.pop()
+        if isinstance(node, LiteralPacket):
+            builder.literal(int(node.value))
+        elif children_done:
+            builder.operator(node.header.type_id, len(node.sub_packets))
+        else:
+            stack.append((node, True))
+            stack.extend((sp, False) for sp in reversed(node.sub_packets))
+    return builder.build()
+
+
+def compile_events(reader: Union[BitCursor, HexStreamReader]) -> PacketProgram:
+    """Compiles straight from iter_packet_events, skipping the tree."""
+    builder = _ProgramBuilder()
+    argcs = [0]
+    for event in iter_packet_events(reader):
+        if event.kind is EventKind.OPERATOR_BEGIN:
+            argcs.append(0)
+        elif event.kind is EventKind.LITERAL:
+            builder.literal(event.value)
+            argcs[-1] += 1
+        elif event.kind is EventKind.OPERATOR_END:
+            builder.operator(event.type_id, argcs.pop())
+            argcs[-1] += 1
+    program = builder.build()
+    metrics.observe("day_16.program_length", len(program))
+    return program
+
+
+@lru_cache(maxsize=1024)
+def compile_hex(hex: str) -> PacketProgram:
+    """Compiles a hexidecimal transmission, caching the program."""
+    metrics.count("day_16.compile_hex.misses")
+    return compile_events(BitCursor.from_hex(hex))
+
+
+@lru_cache(maxsize=1024)
+def evaluate_hex(hex: str) -> int:
+    """
+    Returns the value of a hexidecimal transmission. Results are kept
+    in an LRU cache keyed by the hex string, so repeated requests skip
+    parsing and evaluation; see evaluate_hex.cache_info().
+    """
+    return compile_hex(hex).evaluate()
+
+
+def part_1(filename: str = utils.input_location(day=16)) -> int:
+    """Sum of the version numbers of every packet in the transmission."""
+    return evaluate_file(filename).version_sum
+
+
+def part_2(filename: str = utils.input_location(day=16)) -> int:
+    """Value of the expression the transmission encodes."""
+    return evaluate_file(filename).value
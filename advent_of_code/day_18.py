@@ -7,10 +7,15 @@ Contains the additional modules and logic.
 """
 
 from __future__ import annotations
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import List
-import copy
+from typing import Iterable, List, Optional, Tuple, Union
+import math
+import multiprocessing
 import re
+from advent_of_code import metrics
+from advent_of_code.utils import input_location
 
 
 @dataclass(frozen=True, eq=True, order=True)
@@ -35,30 +40,31 @@ class SailFishNumber:
 
     elements: List[Element]
 
+    @classmethod
+    def from_arrays(cls, values: array, depths: array) -> SailFishNumber:
+        """Builds a SailFishNumber from parallel value/depth buffers."""
+        return cls([Element(v, d) for v, d in zip(values, depths)])
+
+    def to_arrays(self) -> Tuple[array, array]:
+        """Returns the elements as parallel value/depth buffers."""
+        return (
+            array("i", [e.value for e in self.elements]),
+            array("i", [e.depth for e in self.elements]),
+        )
+
     def add(self, b: SailFishNumber) -> SailFishNumber:
         """
         Adds SailFishNumber b to this object and returns a new object
         containing the two numbers added reduced.
         """
-
-        def reducer(s: SailFishNumber) -> SailFishNumber:
-            # attempt to explode; if mutated recurse else try split
-            exploded_sfn = s.explode()
-            if not s == exploded_sfn:
-                return reducer(exploded_sfn)
-
-            # attempt to split; if mutated recurse else return s.
-            split_sfn = s.split()
-            if not s == split_sfn:
-                return reducer(split_sfn)
-
-            # no change so must be fully reduced.
-            return s
-
-        sfn = SailFishNumber(
-            [Element(e.value, e.depth + 1) for e in self.elements + b.elements]
-        )
-        return reducer(sfn)
+        values, depths = self.to_arrays()
+        b_values, b_depths = b.to_arrays()
+        values.extend(b_values)
+        depths.extend(b_depths)
+        for i in range(len(depths)):
+            depths[i] += 1
+        reduce_in_place(values, depths)
+        return SailFishNumber.from_arrays(values, depths)
 
     def __add__(self, x: SailFishNumber) -> SailFishNumber:
         """
@@ -67,53 +73,143 @@ class SailFishNumber:
         return self.add(x)
 
     def split(self) -> SailFishNumber:
-        x = copy.deepcopy(self.elements)
-        for i, e in enumerate(x):
-            if e.value < 10:
-                continue
-            down = e.value // 2
-            up = e.value - down
-            return SailFishNumber(
-                x[:i]
-                + [Element(down, e.depth + 1), Element(up, e.depth + 1)]
-                + x[i + 1 :]
-            )
+        """Splits the leftmost value of 10 or more, if there is one."""
+        values, depths = self.to_arrays()
+        for i, value in enumerate(values):
+            if value >= 10:
+                split_at(values, depths, i)
+                return SailFishNumber.from_arrays(values, depths)
         return self
 
     def explode(self) -> SailFishNumber:
-        x = copy.deepcopy(self.elements)
-        for i, (e1, e2) in enumerate(zip(x, x[1:])):
+        """Explodes the leftmost pair nested inside four pairs, if any."""
+        values, depths = self.to_arrays()
+        i = find_explode(depths)
+        if i < 0:
+            return self
+        explode_at(values, depths, i)
+        return SailFishNumber.from_arrays(values, depths)
 
-            if e1.depth < 5 or e1.depth != e2.depth:
-                continue
-            if i > 0:
-                x[i - 1] = Element(x[i - 1].value + e1.value, x[i - 1].depth)
+    def magnitude(self) -> int:
+        """Compute magnitude from bottom up with a stack."""
+        return magnitude_of(*self.to_arrays())
 
-            if i < len(x) - 2:
-                x[i + 2] = Element(x[i + 2].value + e2.value, x[i + 2].depth)
 
-            return SailFishNumber(
-                x[:i] + [Element(0, e1.depth - 1)] + x[i + 2 :]
-            )
-        return self
+# the largest multiplier magnitude can give a leaf at depth <= 4.
+MAX_LEAF_WEIGHT = 3**4
 
-    def magnitude(self) -> int:
-        """Recursively compute magnitude from bottom up."""
-        x = copy.deepcopy(self.elements)
-        while len(x) > 1:
-            for i, (e1, e2) in enumerate(zip(x, x[1:])):
-                (value1, depth1) = (
-                    (e1.value, e1.depth) if isinstance(e1, Element) else e1
-                )
-                (value2, depth2) = (
-                    (e2.value, e2.depth) if isinstance(e2, Element) else e2
-                )
-                if depth1 != depth2:
-                    continue
-                val = value1 * 3 + value2 * 2
-                x = x[:i] + [(val, depth1 - 1)] + x[i + 2 :]
+
+def find_explode(depths: array, start: int = 0) -> int:
+    """
+    Returns the index of the leftmost explodable pair at or after start,
+    or -1 if there is none.
+    """
+    for i in range(start, len(depths) - 1):
+        if depths[i] >= 5 and depths[i] == depths[i + 1]:
+            return i
+    return -1
+
+
+def explode_at(values: array, depths: array, i: int) -> int:
+    """
+    Explodes the pair at elements i, i + 1 in place. Returns the value
+    lost off either end of the number.
+    """
+    lost = 0
+    if i > 0:
+        values[i - 1] += values[i]
+    else:
+        lost += values[i]
+    if i + 2 < len(values):
+        values[i + 2] += values[i + 1]
+    else:
+        lost += values[i + 1]
+    values[i] = 0
+    depths[i] -= 1
+    del values[i + 1]
+    del depths[i + 1]
+    return lost
+
+
+def split_at(values: array, depths: array, i: int):
+    """Splits element i into a pair in place."""
+    down = values[i] // 2
+    up = values[i] - down
+    depths[i] += 1
+    values[i] = down
+    values.insert(i + 1, up)
+    depths.insert(i + 1, depths[i])
+
+
+def reduce_in_place(
+    values: array, depths: array, floor: Optional[int] = None
+) -> bool:
+    """
+    Fully reduces a snailfish number held as value/depth buffers.
+
+    Explosions only ever change the neighbours of a pair, and values
+    only grow by exploding, so the leftmost candidate after an action
+    is never more than one element back. Both phases therefore make a
+    single left-to-right pass, stepping back one element after an
+    action instead of rescanning from the start.
+
+    If floor is given, reduction is abandoned (returning False) once the
+    number can no longer reach a magnitude above floor. Splits keep the
+    sum of the values and explosions can only lose value off the ends,
+    while a reduced leaf weighs at most 3 ** 4, so the magnitude can
+    never exceed MAX_LEAF_WEIGHT * sum(values).
+    """
+    budget = math.inf if floor is None else sum(values) * MAX_LEAF_WEIGHT
+    budget -= floor or 0
+    if budget <= 0:
+        metrics.count("day_18.abandoned")
+        return False
+
+    # explode every pair nested too deep.
+    explodes = splits = 0
+    i = 0
+    while i < len(depths) - 1:
+        if depths[i] >= 5 and depths[i] == depths[i + 1]:
+            budget -= explode_at(values, depths, i) * MAX_LEAF_WEIGHT
+            explodes += 1
+            if budget <= 0:
                 break
-        return x[0][0]
+            i = max(i - 1, 0)
+        else:
+            i += 1
+
+    # nothing can explode now, so only a fresh split can need exploding.
+    i = 0
+    while budget > 0 and i < len(values):
+        if values[i] < 10:
+            i += 1
+            continue
+        split_at(values, depths, i)
+        splits += 1
+        if depths[i] >= 5:
+            budget -= explode_at(values, depths, i) * MAX_LEAF_WEIGHT
+            explodes += 1
+            i = max(i - 1, 0)
+
+    if metrics.enabled():
+        metrics.count("day_18.reductions")
+        metrics.count("day_18.explodes", explodes)
+        metrics.count("day_18.splits", splits)
+        metrics.observe("day_18.actions_per_reduction", explodes + splits)
+        if budget <= 0:
+            metrics.count("day_18.abandoned")
+    return budget > 0
+
+
+def magnitude_of(values: array, depths: array) -> int:
+    """Returns the magnitude of a snailfish number's value/depth buffers."""
+    stack: List[Tuple[int, int]] = []
+    for value, depth in zip(values, depths):
+        while stack and stack[-1][1] == depth:
+            left, _ = stack.pop()
+            value, depth = left * 3 + value * 2, depth - 1
+        stack.append((value, depth))
+    return stack[0][0]
 
 
 def str2sailfishnumber(s: str) -> SailFishNumber:
@@ -127,3 +223,101 @@ def str2sailfishnumber(s: str) -> SailFishNumber:
         elif c.isdigit():
             elements.append(Element(int(c), depth))
     return SailFishNumber(elements)
+
+
+# per-process state for max_pair_magnitude workers.
+_PAIR_NUMBERS: List[Tuple[array, array]] = []
+_PAIR_BEST = None
+
+
+def _init_pair_worker(packed: List[Tuple[bytes, bytes]], best):
+    """Unpacks the numbers once per worker, depths already one deeper."""
+    global _PAIR_NUMBERS, _PAIR_BEST
+    _PAIR_NUMBERS = []
+    for value_bytes, depth_bytes in packed:
+        values, depths = array("i"), array("i")
+        values.frombytes(value_bytes)
+        depths.frombytes(depth_bytes)
+        _PAIR_NUMBERS.append((values, array("i", [d + 1 for d in depths])))
+    _PAIR_BEST = best
+
+
+def _pair_rows(rows: range) -> int:
+    """Returns the best magnitude of a + b for every a in rows."""
+    best = _PAIR_BEST.value if _PAIR_BEST is not None else 0
+    for i in rows:
+        a_values, a_depths = _PAIR_NUMBERS[i]
+        for j, (b_values, b_depths) in enumerate(_PAIR_NUMBERS):
+            if i == j:
+                continue
+            values = a_values + b_values
+            depths = a_depths + b_depths
+            if not reduce_in_place(values, depths, floor=best):
+                continue
+            magnitude = magnitude_of(values, depths)
+            if magnitude > best:
+                best = magnitude
+                if _PAIR_BEST is not None:
+                    with _PAIR_BEST.get_lock():
+                        _PAIR_BEST.value = max(_PAIR_BEST.value, best)
+        if _PAIR_BEST is not None:
+            best = max(best, _PAIR_BEST.value)
+    return best
+
+
+def max_pair_magnitude(
+    numbers: Union[Iterable[SailFishNumber], str],
+    max_workers: Optional[int] = None,
+    rows_per_task: int = 4,
+) -> int:
+    """
+    Returns the largest magnitude of a + b over every ordered pair of
+    different numbers. numbers may also be a filename with one snailfish
+    number per line.
+
+    Rows of the pair matrix are spread over a process pool. Each worker
+    receives the numbers once, as packed value/depth buffers, and the
+    workers share the best magnitude found so far so that pairs which
+    cannot beat it are abandoned part way through reduction. With
+    max_workers=1 the search runs in this process.
+    """
+    if isinstance(numbers, str):
+        with open(numbers) as f:
+            numbers = [str2sailfishnumber(line) for line in f if line.strip()]
+    packed = []
+    for number in numbers:
+        values, depths = number.to_arrays()
+        packed.append((values.tobytes(), depths.tobytes()))
+
+    tasks = [
+        range(start, min(start + rows_per_task, len(packed)))
+        for start in range(0, len(packed), rows_per_task)
+    ]
+    best = multiprocessing.Value("q", 0)
+    if max_workers == 1:
+        _init_pair_worker(packed, best)
+        return max(map(_pair_rows, tasks), default=0)
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_pair_worker,
+        initargs=(packed, best),
+    ) as executor:
+        return max(executor.map(_pair_rows, tasks), default=0)
+
+
+def part_1(filename: str = input_location(day=18)) -> int:
+    """Magnitude of the sum of every number in the homework."""
+    with open(filename) as f:
+        numbers = [str2sailfishnumber(line) for line in f if line.strip()]
+    total = numbers[0]
+    for number in numbers[1:]:
+        total = total + number
+    return total.magnitude()
+
+
+def part_2(
+    filename: str = input_location(day=18), max_workers: int = 1
+) -> int:
+    """Largest magnitude of the sum of any two different numbers."""
+    return max_pair_magnitude(filename, max_workers=max_workers)
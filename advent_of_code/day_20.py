@@ -0,0 +1,106 @@
+"""
+Advent of Code 2021 - Day 20: Trench Map
+https://adventofcode.com/2021/day/20
+
+The image is a boolean numpy array of the pixels that can differ from
+the rest of the infinite image, plus the one value every pixel outside
+it shares.
+"""
+
+from __future__ import annotations
+from typing import Iterable, Optional, Tuple
+import numpy as np
+from advent_of_code import metrics
+from advent_of_code.utils import input_location
+
+
+def read_algorithm(line: str) -> np.ndarray:
+    """Parses the 512 character enhancement algorithm as a bool array."""
+    algo = np.frombuffer(line.strip().encode(), dtype=np.uint8) == ord("#")
+    if len(algo) != 512:
+        raise ValueError(f"Algorithm has {len(algo)} entries, not 512.")
+    return algo
+
+
+class Image(object):
+    """
+    An infinite image: `pixels` covers every pixel that may be lit
+    differently from the rest, and every pixel beyond it is
+    `background`.
+    """
+
+    def __init__(self, pixels: np.ndarray, background: bool = False):
+        self.pixels = np.asarray(pixels, dtype=bool)
+        self.background = bool(background)
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str]) -> Image:
+        """Builds an image from rows of '#' (lit) and '.' pixels."""
+        rows = [line.rstrip() for line in lines if line.strip()]
+        return cls(np.array([[c == "#" for c in row] for row in rows]))
+
+    def __repr__(self) -> str:
+        return "\n".join(
+            "".join("#" if lit else "." for lit in row) for row in self.pixels
+        )
+
+    def num_lit_pixels(self) -> int:
+        """Returns the number of pixels that are on (inf if infinite)."""
+        if self.background:
+            return float("inf")
+        return int(np.count_nonzero(self.pixels))
+
+    def enhance(self, algo: np.ndarray, infinite_bit: Optional[int] = None):
+        """
+        Runs one enhancement step in place. The image grows by one pixel
+        on every side: those are the only pixels whose 3x3 window takes
+        in both the known pixels and the background.
+
+        Every background pixel has index 0 (all dark) or 511 (all lit),
+        so the background becomes algo[0] or algo[511]. infinite_bit
+        overrides the current background, as the notebook passed it.
+        """
+        if infinite_bit is not None:
+            self.background = bool(infinite_bit)
+        self.pixels = _enhance_once(self.pixels, self.background, algo)
+        self.background = bool(algo[511 if self.background else 0])
+
+    def enhance_many(self, algo: np.ndarray, steps: int):
+        """Runs steps enhancement steps in place."""
+        for _ in range(steps):
+            self.enhance(algo)
+
+
+def _enhance_once(
+    pixels: np.ndarray, background: bool, algo: np.ndarray
+) -> np.ndarray:
+    """
+    Returns the pixels one step on, one larger on every side. The 9-bit
+    index is built separably: each pixel's row of three becomes a 3-bit
+    code, and three codes stacked vertically make the index.
+    """
+    padded = np.pad(pixels, 2, constant_values=background).astype(np.uint16)
+    rows = (padded[:, :-2] << 2) | (padded[:, 1:-1] << 1) | padded[:, 2:]
+    index = (rows[:-2] << 6) | (rows[1:-1] << 3) | rows[2:]
+    metrics.count("day_20.steps")
+    return np.take(algo, index)  # a flat gather, cheaper than algo[index]
+
+
+def read_input(input_file: str) -> Tuple[np.ndarray, Image]:
+    """Reads the enhancement algorithm and the starting image."""
+    with open(input_file) as f:
+        algo = read_algorithm(f.readline())
+        image = Image.from_lines(f)
+    return algo, image
+
+
+def part_1(input_file: str = input_location(day=20), steps: int = 2) -> int:
+    """Pixels lit after steps enhancements."""
+    algo, image = read_input(input_file)
+    image.enhance_many(algo, steps)
+    return image.num_lit_pixels()
+
+
+def part_2(input_file: str = input_location(day=20)) -> int:
+    """Part 1 after 50 enhancements."""
+    return part_1(input_file, steps=50)
@@ -2,7 +2,10 @@
 Day 21 Modules
 """
 
+from collections import defaultdict
 from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+from advent_of_code import metrics
 
 
 @dataclass
@@ -33,3 +36,197 @@ class Player:
 
     def won_game(self, max_score: int = 1000) -> bool:
         return self.score >= max_score
+
+
+@dataclass(frozen=True)
+class DiracRules:
+    """The shape of a Dirac dice game."""
+
+    board_size: int = 10
+    die_faces: int = 3
+    rolls_per_turn: int = 3
+    winning_score: int = 21
+
+
+def roll_sum_frequencies(
+    die_faces: int = 3, rolls_per_turn: int = 3
+) -> List[Tuple[int, int]]:
+    """
+    Returns (sum, universes) for every total a turn's rolls can make,
+    e.g. a 3 sided die rolled 3 times makes 7 sums from 27 universes.
+    """
+    frequencies = {0: 1}
+    for _ in range(rolls_per_turn):
+        rolled: Dict[int, int] = defaultdict(int)
+        for total, count in frequencies.items():
+            for face in range(1, die_faces + 1):
+                rolled[total + face] += count
+        frequencies = rolled
+    return sorted(frequencies.items())
+
+
+def turn_outcomes(
+    start: int, rules: DiracRules = DiracRules()
+) -> Tuple[List[int], List[int]]:
+    """
+    Plays one player alone. Returns (wins, alive) where wins[t] is the
+    number of universes in which the player first reaches the winning
+    score on their t-th turn and alive[t] the number still short of it
+    after t turns.
+
+    The table for each turn is a flat list indexed by the packed state
+    position * winning_score + score, and each turn's table is filled
+    from the previous one, so only two turns are held at once. Scores
+    rise every turn, so there are at most winning_score turns.
+    """
+    board, target = rules.board_size, rules.winning_score
+    rolls = roll_sum_frequencies(rules.die_faces, rules.rolls_per_turn)
+    table = [0] * (board * target)
+    table[(start - 1) * target] = 1
+    wins, alive = [0], [1]
+    while alive[-1]:
+        next_table = [0] * (board * target)
+        won = 0
+        for state, count in enumerate(table):
+            if not count:
+                continue
+            position, score = divmod(state, target)
+            for total, universes in rolls:
+                new_position = (position + total) % board
+                new_score = score + new_position + 1
+                if new_score >= target:
+                    won += count * universes
+                else:
+                    next_table[new_position * target + new_score] += (
+                        count * universes
+                    )
+        wins.append(won)
+        alive.append(sum(next_table))
+        table = next_table
+        if metrics.enabled():
+            metrics.observe(
+                "day_21.live_states", sum(1 for count in table if count)
+            )
+    metrics.count("day_21.turns", len(wins) - 1)
+    return wins, alive
+
+
+def dirac_wins(
+    p1_start: int, p2_start: int, rules: DiracRules = DiracRules()
+) -> Tuple[int, int]:
+    """
+    Returns the number of universes in which player 1 and player 2 win.
+
+    The players never interact, so each is played alone by turn_outcomes
+    and the tables are combined: player 1 wins on their t-th turn in the
+    universes where player 2 has survived t - 1 turns, and player 2 wins
+    on their t-th turn where player 1 has survived t turns.
+    """
+    wins_1, alive_1 = turn_outcomes(p1_start, rules)
+    wins_2, alive_2 = turn_outcomes(p2_start, rules)
+
+    def survived(alive: List[int], turns: int) -> int:
+        return alive[turns] if turns < len(alive) else 0
+
+    p1_wins = sum(
+        won * survived(alive_2, turn - 1) for turn, won in enumerate(wins_1)
+    )
+    p2_wins = sum(
+        won * survived(alive_1, turn) for turn, won in enumerate(wins_2)
+    )
+    return p1_wins, p2_wins
+
+
+@dataclass(frozen=True)
+class GameResult:
+    """The end of a deterministic game."""
+
+    scores: Tuple[int, int]
+    positions: Tuple[int, int]
+    roll_count: int
+
+    def winner(self) -> int:
+        """Returns the index (0 or 1) of the player who won."""
+        return 0 if self.scores[0] >= self.scores[1] else 1
+
+    def losing_score(self) -> int:
+        return self.scores[1 - self.winner()]
+
+
+def _turn_total(die: int, rolls_per_turn: int, die_faces: int) -> int:
+    """
+    Returns the sum of rolls_per_turn deterministic rolls when the next
+    roll shows face die + 1, without rolling them one at a time.
+    """
+    wraps, rest = divmod(rolls_per_turn, die_faces)
+    total = wraps * die_faces * (die_faces + 1) // 2
+    # the rest run die + 1 .. die + rest, wrapping past die_faces.
+    head = min(rest, die_faces - die)
+    total += head * (die + 1) + head * (head - 1) // 2
+    tail = rest - head
+    total += tail * (tail + 1) // 2
+    return total
+
+
+def fast_forward(
+    p1_start: int,
+    p2_start: int,
+    winning_score: int = 1000,
+    die_faces: int = 100,
+    board_size: int = 10,
+    rolls_per_turn: int = 3,
+) -> GameResult:
+    """
+    Plays the DeterministicDie game to the end without stepping through
+    each roll.
+
+    The game is a walk through the finite states (die face, both
+    positions, player to move), so it soon revisits one. From the two
+    visits we know how many rolls one cycle takes and how much each
+    player scores over it, and jump over as many whole cycles as leave
+    a full cycle of headroom below winning_score. The last stretch
+    (under two cycles) is then played turn by turn. Each turn's rolls
+    are summed in closed form, so large dice cost the same as small.
+    """
+    positions = [p1_start, p2_start]
+    scores = [0, 0]
+    die, roll_count, turn = 0, 0, 0
+    seen: Dict[Tuple[int, int, int, int], Tuple[int, int, int]] = {}
+    while True:
+        if seen is not None:
+            state = (die, positions[0], positions[1], turn)
+            if state in seen:
+                cycle_rolls, s1, s2 = seen[state]
+                gains = (scores[0] - s1, scores[1] - s2)
+                cycles = min(
+                    (winning_score - 1 - score) // gain - 1
+                    for score, gain in zip(scores, gains)
+                    if gain
+                )
+                if cycles > 0:
+                    metrics.count("day_21.cycles_skipped", cycles)
+                    scores = [s + cycles * g for s, g in zip(scores, gains)]
+                    roll_count += cycles * (roll_count - cycle_rolls)
+                seen = None
+            else:
+                seen[state] = (roll_count, scores[0], scores[1])
+
+        total = _turn_total(die, rolls_per_turn, die_faces)
+        die = (die + rolls_per_turn) % die_faces
+        roll_count += rolls_per_turn
+        positions[turn] = (positions[turn] - 1 + total) % board_size + 1
+        scores[turn] += positions[turn]
+        if scores[turn] >= winning_score:
+            return GameResult(tuple(scores), tuple(positions), roll_count)
+        turn = 1 - turn
+
+
+def part_1(p1_start: int = 7, p2_start: int = 9) -> int:
+    """Losing score times die rolls in the deterministic game."""
+    result = fast_forward(p1_start, p2_start)
+    return result.losing_score() * result.roll_count
+
+
+def part_2(p1_start: int = 7, p2_start: int = 9) -> int:
+    """Universes won by the player who wins in more of them."""
+    return max(dirac_wins(p1_start, p2_start))
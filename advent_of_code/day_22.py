@@ -1,7 +1,24 @@
 """Day 22 Modules"""
 
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+from typing import (
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Union,
+)
+import re
+import numpy as np
+from advent_of_code import metrics
+from advent_of_code.utils import input_location
+
+INSTRUCTION_PATTERN = re.compile(
+    r"(off|on) x=(-?\d+)\.\.(-?\d+),y=(-?\d+)\.\.(-?\d+),"
+    r"z=(-?\d+)\.\.(-?\d+)"
+)
 
 
 @dataclass(frozen=True, eq=True)
@@ -38,6 +55,54 @@ class Cube:
             else inter
         )
 
+    def subtract(self, c1: Cube) -> List[Cube]:
+        """
+        Returns disjoint Cubes covering the part of this Cube that is
+        outside c1 (at most six of them).
+        """
+        if (
+            self.xmin > c1.xmax
+            or self.xmax < c1.xmin
+            or self.ymin > c1.ymax
+            or self.ymax < c1.ymin
+            or self.zmin > c1.zmax
+            or self.zmax < c1.zmin
+        ):
+            return [self]
+
+        pieces: List[Cube] = []
+        xmin, xmax, ymin, ymax = self.xmin, self.xmax, self.ymin, self.ymax
+        zmin, zmax = self.zmin, self.zmax
+        if xmin < c1.xmin:
+            pieces.append(
+                Cube(self.add, xmin, c1.xmin - 1, ymin, ymax, zmin, zmax)
+            )
+            xmin = c1.xmin
+        if xmax > c1.xmax:
+            pieces.append(
+                Cube(self.add, c1.xmax + 1, xmax, ymin, ymax, zmin, zmax)
+            )
+            xmax = c1.xmax
+        if ymin < c1.ymin:
+            pieces.append(
+                Cube(self.add, xmin, xmax, ymin, c1.ymin - 1, zmin, zmax)
+            )
+            ymin = c1.ymin
+        if ymax > c1.ymax:
+            pieces.append(
+                Cube(self.add, xmin, xmax, c1.ymax + 1, ymax, zmin, zmax)
+            )
+            ymax = c1.ymax
+        if zmin < c1.zmin:
+            pieces.append(
+                Cube(self.add, xmin, xmax, ymin, ymax, zmin, c1.zmin - 1)
+            )
+        if zmax > c1.zmax:
+            pieces.append(
+                Cube(self.add, xmin, xmax, ymin, ymax, c1.zmax + 1, zmax)
+            )
+        return pieces
+
     def count_on(self):
         """Returns cores to count in this Cube."""
         return (
@@ -57,3 +122,444 @@ class Cube:
             and lower <= self.zmin <= upper
             and lower <= self.zmax <= upper
         )
+
+
+def instruction_to_cube(instruction: str) -> Optional[Cube]:
+    """
+    Parses the instruction into a Cube oject
+        e.g., "on x=67154..79964,y=36813..47407,z=-14931..-10102"
+    Returns a Cube, or None if the line is not an instruction.
+    """
+    m = INSTRUCTION_PATTERN.search(instruction)
+    if not m:
+        return None
+    x1, x2 = sorted([int(m.group(2)), int(m.group(3))])
+    y1, y2 = sorted([int(m.group(4)), int(m.group(5))])
+    z1, z2 = sorted([int(m.group(6)), int(m.group(7))])
+    return Cube(m.group(1) == "on", x1, x2, y1, y2, z1, z2)
+
+
+def read_cubes(
+    filename: str, bound: bool = False, lower: int = -50, upper: int = 50
+) -> List[Cube]:
+    """Reads the reboot steps in a file, optionally only those in bounds."""
+    with open(filename) as f:
+        cubes = [instruction_to_cube(line) for line in f if line.strip()]
+    return [
+        c
+        for c in cubes
+        if c is not None and (not bound or c.in_bounds(lower, upper))
+    ]
+
+
+def count_on_inclusion_exclusion(cubes: Iterable[Cube]) -> int:
+    """
+    Returns the lit cores after the reboot steps by inclusion-exclusion:
+    every step is intersected with every signed Cube kept so far.
+    """
+    reactor_cores: List[Cube] = []
+    for c1 in cubes:
+        new_cores: List[Cube] = [c1] if c1.add else []
+        metrics.count("day_22.intersections", len(reactor_cores))
+        for core in reactor_cores:
+            intersect = core.intersection(c1)
+            if intersect:
+                new_cores.append(intersect)
+        reactor_cores += new_cores
+    metrics.observe("day_22.signed_cubes", len(reactor_cores))
+    return sum([core.count_on() for core in reactor_cores])
+
+
+def _overlaps(a: Cube, b: Cube) -> bool:
+    """True if the two Cubes share at least one core."""
+    return not (
+        a.xmin > b.xmax
+        or a.xmax < b.xmin
+        or a.ymin > b.ymax
+        or a.ymax < b.ymin
+        or a.zmin > b.zmax
+        or a.zmax < b.zmin
+    )
+
+
+def _contains(outer: Cube, inner: Cube) -> bool:
+    """True if every core of inner is inside outer."""
+    return (
+        outer.xmin <= inner.xmin
+        and inner.xmax <= outer.xmax
+        and outer.ymin <= inner.ymin
+        and inner.ymax <= outer.ymax
+        and outer.zmin <= inner.zmin
+        and inner.zmax <= outer.zmax
+    )
+
+
+def _clip(c1: Cube, bounds: Cube) -> Cube:
+    """Returns the part of c1 inside bounds, keeping c1.add."""
+    return Cube(
+        c1.add,
+        max(c1.xmin, bounds.xmin),
+        min(c1.xmax, bounds.xmax),
+        max(c1.ymin, bounds.ymin),
+        min(c1.ymax, bounds.ymax),
+        max(c1.zmin, bounds.zmin),
+        min(c1.zmax, bounds.zmax),
+    )
+
+
+AXES = (("xmin", "xmax"), ("ymin", "ymax"), ("zmin", "zmax"))
+
+# effectively unbounded space for the root of a BoxTree.
+UNIVERSE = Cube(
+    True, -(1 << 62), 1 << 62, -(1 << 62), 1 << 62, -(1 << 62), 1 << 62
+)
+
+
+class _BoxNode(object):
+    """A BoxTree node: a leaf of disjoint lit boxes or two children."""
+
+    __slots__ = ("bounds", "boxes", "low", "high", "count")
+
+    def __init__(self, bounds: Cube, boxes: Optional[List[Cube]] = None):
+        self.bounds = bounds
+        self.boxes = boxes if boxes is not None else []
+        self.low: Optional[_BoxNode] = None
+        self.high: Optional[_BoxNode] = None
+        self.count = sum(box.count_on() for box in self.boxes)
+
+
+class BoxTree(object):
+    """
+    The lit region of a reactor as disjoint boxes in a k-d tree.
+
+    Leaves hold at most leaf_size boxes and split on a box edge when
+    they grow past it, cutting the few boxes that straddle the plane.
+    A reboot step only visits the nodes it overlaps, and a node the step
+    covers completely collapses to a single box (or to nothing), so the
+    tree stays proportional to the lit region rather than the history.
+    """
+
+    def __init__(self, bounds: Cube = UNIVERSE, leaf_size: int = 16):
+        self.root = _BoxNode(bounds)
+        self.leaf_size = leaf_size
+
+    def apply(self, c1: Cube):
+        """Turns the cores in c1 on (c1.add) or off."""
+        self._apply(self.root, c1)
+
+    def _apply(self, node: _BoxNode, c1: Cube):
+        if not _overlaps(node.bounds, c1):
+            return
+        if _contains(c1, node.bounds):
+            node.low = node.high = None
+            node.boxes = [node.bounds] if c1.add else []
+            node.count = node.bounds.count_on() if c1.add else 0
+            return
+
+        if node.low is None:
+            metrics.count("day_22.subtractions", len(node.boxes))
+            boxes: List[Cube] = []
+            for box in node.boxes:
+                boxes.extend(box.subtract(c1))
+            if c1.add:
+                boxes.append(_clip(c1, node.bounds))
+            node.boxes = boxes
+            node.count = sum(box.count_on() for box in boxes)
+            if len(boxes) > self.leaf_size:
+                self._split(node)
+            return
+
+        self._apply(node.low, c1)
+        self._apply(node.high, c1)
+        low, high = node.low, node.high
+        node.count = low.count + high.count
+        if (
+            low.low is None
+            and high.low is None
+            and len(low.boxes) + len(high.boxes) <= self.leaf_size // 2
+        ):
+            node.boxes = low.boxes + high.boxes
+            node.low = node.high = None
+
+    def _split(self, node: _BoxNode):
+        """Splits a leaf on the box edge that cuts the fewest boxes."""
+        metrics.count("day_22.leaf_splits")
+        best = None
+        for lo_attr, hi_attr in AXES:
+            lo = getattr(node.bounds, lo_attr)
+            hi = getattr(node.bounds, hi_attr)
+            edges = sorted(
+                {getattr(b, lo_attr) for b in node.boxes}
+                | {getattr(b, hi_attr) + 1 for b in node.boxes}
+            )
+            edges = [e for e in edges if lo < e <= hi]
+            if not edges:
+                continue
+            plane = edges[len(edges) // 2]
+            cuts = sum(
+                getattr(b, lo_attr) < plane <= getattr(b, hi_attr)
+                for b in node.boxes
+            )
+            if best is None or cuts < best[0]:
+                best = (cuts, lo_attr, hi_attr, plane)
+        if best is None:
+            return
+
+        _, lo_attr, hi_attr, plane = best
+        low_boxes: List[Cube] = []
+        high_boxes: List[Cube] = []
+        for box in node.boxes:
+            if getattr(box, hi_attr) < plane:
+                low_boxes.append(box)
+            elif getattr(box, lo_attr) >= plane:
+                high_boxes.append(box)
+            else:
+                low_boxes.append(replace(box, **{hi_attr: plane - 1}))
+                high_boxes.append(replace(box, **{lo_attr: plane}))
+        node.low = _BoxNode(
+            replace(node.bounds, **{hi_attr: plane - 1}), low_boxes
+        )
+        node.high = _BoxNode(
+            replace(node.bounds, **{lo_attr: plane}), high_boxes
+        )
+        node.boxes = []
+        for child in (node.low, node.high):
+            if len(child.boxes) > self.leaf_size:
+                self._split(child)
+
+    def leaves(self) -> Iterator[_BoxNode]:
+        """Yields every leaf node."""
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node.low is None:
+                yield node
+            else:
+                stack += [node.low, node.high]
+
+    def boxes(self) -> Iterator[Cube]:
+        """Yields the disjoint lit boxes."""
+        for leaf in self.leaves():
+            yield from leaf.boxes
+
+    def count_on(self, region: Optional[Cube] = None) -> int:
+        """
+        Returns the number of lit cores, in region if one is given.
+        Subtrees entirely inside region answer from their cached count,
+        so only nodes straddling the region's faces are opened.
+        """
+        if region is None:
+            return self.root.count
+        count = 0
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if not node.count or not _overlaps(node.bounds, region):
+                continue
+            if _contains(region, node.bounds):
+                count += node.count
+            elif node.low is None:
+                count += sum(
+                    _clip(box, region).count_on()
+                    for box in node.boxes
+                    if _overlaps(box, region)
+                )
+            else:
+                stack += [node.low, node.high]
+        return count
+
+    def is_on(self, x: int, y: int, z: int) -> bool:
+        """Returns True if the core at x, y, z is lit."""
+        point = Cube(True, x, x, y, y, z, z)
+        node = self.root
+        if not _contains(node.bounds, point):
+            return False
+        while node.low is not None:
+            node = node.low if _contains(node.low.bounds, point) else node.high
+        return any(_contains(box, point) for box in node.boxes)
+
+
+class Reactor(object):
+    """
+    The reactor's cores, updated one reboot step at a time. The lit
+    region is kept in a BoxTree, so point and region queries between
+    steps only touch the boxes that overlap them.
+    """
+
+    def __init__(self):
+        self.tree = BoxTree()
+        self.steps = 0
+
+    def apply(self, step: Union[Cube, str]):
+        """Applies a reboot step, given as a Cube or an instruction."""
+        c1 = instruction_to_cube(step) if isinstance(step, str) else step
+        if c1 is None:
+            raise ValueError(f"Not a reboot step: {step!r}")
+        self.tree.apply(c1)
+        self.steps += 1
+
+    def is_on(self, x: int, y: int, z: int) -> bool:
+        """Returns True if the core at x, y, z is on."""
+        return self.tree.is_on(x, y, z)
+
+    def count_on(self, region: Optional[Cube] = None) -> int:
+        """Returns the cores on, inside region if one is given."""
+        return self.tree.count_on(region)
+
+
+def count_on_disjoint(cubes: Iterable[Cube]) -> int:
+    """
+    Returns the lit cores after the reboot steps by keeping only the
+    lit region, as disjoint boxes in a BoxTree. Each step carves itself
+    out of the boxes it touches and is then added whole if it turns
+    cores on, so memory follows the lit region and not the history.
+    """
+    tree = BoxTree()
+    for c1 in cubes:
+        tree.apply(c1)
+    return tree.count_on()
+
+
+class CubeSet(object):
+    """
+    Signed Cubes stored column-wise: an (n, 6) int64 array of
+    xmin, xmax, ymin, ymax, zmin, zmax and an int64 sign column (+1 for
+    an added Cube, -1 for a subtracted one). Rows are appended into
+    buffers that grow geometrically, so extending is amortised O(rows).
+    """
+
+    def __init__(self, bounds=None, signs=None):
+        self._bounds = (
+            np.empty((0, 6), dtype=np.int64)
+            if bounds is None
+            else np.asarray(bounds, dtype=np.int64).reshape(-1, 6)
+        )
+        self._signs = (
+            np.empty(0, dtype=np.int64)
+            if signs is None
+            else np.asarray(signs, dtype=np.int64).reshape(-1)
+        )
+        self._size = len(self._signs)
+
+    @classmethod
+    def from_cubes(cls, cubes: Iterable[Cube]) -> CubeSet:
+        """Builds a CubeSet from Cube objects."""
+        cubes = list(cubes)
+        return cls(
+            [(c.xmin, c.xmax, c.ymin, c.ymax, c.zmin, c.zmax) for c in cubes],
+            [1 if c.add else -1 for c in cubes],
+        )
+
+    @property
+    def bounds(self) -> np.ndarray:
+        """The (n, 6) bounds of the Cubes in the set."""
+        return self._bounds[: self._size]
+
+    @property
+    def signs(self) -> np.ndarray:
+        """The sign of each Cube in the set."""
+        return self._signs[: self._size]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[Cube]:
+        for row, sign in zip(self.bounds.tolist(), self.signs.tolist()):
+            yield Cube(sign > 0, *row)
+
+    def _reserve(self, extra: int):
+        """Makes room for extra more rows."""
+        needed = self._size + extra
+        if needed <= len(self._signs):
+            return
+        capacity = max(needed, 2 * len(self._signs), 16)
+        bounds = np.empty((capacity, 6), dtype=np.int64)
+        signs = np.empty(capacity, dtype=np.int64)
+        bounds[: self._size] = self.bounds
+        signs[: self._size] = self.signs
+        self._bounds, self._signs = bounds, signs
+
+    def append(self, c1: Cube):
+        """Adds a single Cube."""
+        self._reserve(1)
+        self._bounds[self._size] = (
+            c1.xmin,
+            c1.xmax,
+            c1.ymin,
+            c1.ymax,
+            c1.zmin,
+            c1.zmax,
+        )
+        self._signs[self._size] = 1 if c1.add else -1
+        self._size += 1
+
+    def extend(self, other: CubeSet):
+        """Adds every Cube in other."""
+        self._reserve(len(other))
+        start, end = self._size, self._size + len(other)
+        self._bounds[start:end] = other.bounds
+        self._signs[start:end] = other.signs
+        self._size = end
+
+    def intersect_all(self, c1: Cube) -> CubeSet:
+        """
+        Returns the non-empty intersections of c1 with every Cube in the
+        set, each with the opposite sign of the Cube it came from (the
+        vector form of Cube.intersection).
+        """
+        metrics.count("day_22.intersections", len(self))
+        bounds = self.bounds
+        lo = np.maximum(bounds[:, 0::2], (c1.xmin, c1.ymin, c1.zmin))
+        hi = np.minimum(bounds[:, 1::2], (c1.xmax, c1.ymax, c1.zmax))
+        keep = np.all(lo <= hi, axis=1)
+        inter = np.empty((int(keep.sum()), 6), dtype=np.int64)
+        inter[:, 0::2] = lo[keep]
+        inter[:, 1::2] = hi[keep]
+        return CubeSet(inter, -self.signs[keep])
+
+    def volume(self) -> int:
+        """
+        Returns the signed sum of the Cubes' volumes (the vector form of
+        Cube.count_on). int64 arithmetic wraps, so partial sums may
+        overflow as long as the total fits.
+        """
+        bounds = self.bounds
+        sizes = np.prod(bounds[:, 1::2] - bounds[:, 0::2] + 1, axis=1)
+        return int(np.sum(self.signs * sizes))
+
+
+def count_on_vectorized(cubes: Iterable[Cube]) -> int:
+    """
+    Returns the lit cores after the reboot steps by the same
+    inclusion-exclusion as count_on_inclusion_exclusion, with each step
+    intersected against all the signed Cubes at once in a CubeSet.
+    """
+    reactor_cores = CubeSet()
+    for c1 in cubes:
+        reactor_cores.extend(reactor_cores.intersect_all(c1))
+        if c1.add:
+            reactor_cores.append(c1)
+    return reactor_cores.volume()
+
+
+def run_sequence(
+    instructions: Iterable[str],
+    bound: bool = True,
+    engine: Callable[[Iterable[Cube]], int] = count_on_disjoint,
+) -> int:
+    """takes instructions, returns count of 'on' cores."""
+    cubes = (instruction_to_cube(i) for i in instructions)
+    with metrics.timer("day_22.run_sequence"):
+        return engine(
+            c for c in cubes if c and (not bound or c.in_bounds(-50, 50))
+        )
+
+
+def part_1(filename: str = input_location(day=22)) -> int:
+    """Cores on after the initialization steps (within -50..50)."""
+    return count_on_disjoint(read_cubes(filename, bound=True))
+
+
+def part_2(filename: str = input_location(day=22)) -> int:
+    """Cores on after every reboot step."""
+    return count_on_disjoint(read_cubes(filename))
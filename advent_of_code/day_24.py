@@ -0,0 +1,296 @@
+"""
+Advent of Code 2021 - Day 24: Arithmetic Logic Unit
+https://adventofcode.com/2021/day/24
+
+The MONAD program is split into blocks at each `inp w`, and each block
+is compiled once into a numpy kernel taking arrays of w and z. The
+search then runs every surviving z state against all nine digits as
+one array per block.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from advent_of_code import metrics
+from advent_of_code.utils import input_location
+
+Instruction = Tuple[str, ...]
+REGISTERS = ("w", "x", "y", "z")
+DIGITS = np.arange(1, 10, dtype=np.int64)
+
+# numpy source for each binary instruction, for operands a and b.
+_KERNEL_OPS = {
+    "add": "{a} + {b}",
+    "mul": "{a} * {b}",
+    "div": "_div({a}, {b})",
+    "mod": "{a} % {b}",
+    "eql": "_eql({a}, {b})",
+}
+
+# The shape of a MONAD block. Numbers stand for themselves; names are
+# the constants that vary from block to block.
+_MONAD_SHAPE = [
+    ("mul", "x", 0),
+    ("add", "x", "z"),
+    ("mod", "x", "base"),
+    ("div", "z", "divisor"),
+    ("add", "x", "check"),
+    ("eql", "x", "w"),
+    ("eql", "x", 0),
+    ("mul", "y", 0),
+    ("add", "y", "scale"),
+    ("mul", "y", "x"),
+    ("add", "y", 1),
+    ("mul", "z", "y"),
+    ("mul", "y", 0),
+    ("add", "y", "w"),
+    ("add", "y", "offset"),
+    ("mul", "y", "x"),
+    ("add", "z", "y"),
+]
+
+
+def _div(a, b):
+    """Integer division truncating toward zero, as the ALU does."""
+    return (a - np.fmod(a, b)) // b
+
+
+def _eql(a, b):
+    return np.equal(a, b).astype(np.int64)
+
+
+def _constant_op(op: str, a: int, b: int) -> int:
+    """Evaluates an instruction on known values."""
+    if op == "add":
+        return a + b
+    if op == "mul":
+        return a * b
+    if op == "div":
+        return int(_div(a, b))
+    if op == "mod":
+        return a % b
+    return int(a == b)
+
+
+def _fold(
+    op: str,
+    a: str,
+    left: Union[int, str],
+    right: Union[int, str],
+    known: Dict[str, Optional[int]],
+) -> Optional[str]:
+    """
+    Returns the kernel line for `op a b` given its operand values (ints
+    when known), or None when it folds away, updating known.
+    """
+    if isinstance(left, int) and isinstance(right, int):
+        known[a] = _constant_op(op, left, right)
+        return None
+    if (op in ("mul", "div") and right == 1) or (op == "add" and right == 0):
+        return None
+    known[a] = None
+    if op == "add" and left == 0:
+        return f"{a} = {right}"
+    return f"{a} = " + _KERNEL_OPS[op].format(a=left, b=right)
+
+
+def _monad_constants(
+    block: Sequence[Instruction],
+) -> Optional[Dict[str, int]]:
+    """
+    Returns the constants of a block in MONAD shape, or None if it has
+    another shape.
+    """
+    if len(block) != len(_MONAD_SHAPE):
+        return None
+    constants: Dict[str, int] = {}
+    for instruction, expected in zip(block, _MONAD_SHAPE):
+        if instruction[:2] != expected[:2]:
+            return None
+        operand = expected[2]
+        if isinstance(operand, int) or operand in REGISTERS:
+            if instruction[2] != str(operand):
+                return None
+        elif instruction[2] in REGISTERS:
+            return None
+        else:
+            constants[operand] = int(instruction[2])
+    return constants
+
+
+def _only_divides_z(block: Sequence[Instruction]) -> bool:
+    """
+    Whether the block sets z = (z div d) * (scale * x + 1) + (w + c) * x
+    with x 0 or 1, d and the mod base positive and scale, c >= 0. Then
+    for w >= 1 the new z is never below z div d, so only the `div z d`
+    can make z smaller.
+    """
+    constants = _monad_constants(block)
+    return constants is not None and (
+        constants["base"] > 0
+        and constants["divisor"] > 0
+        and constants["scale"] >= 0
+        and constants["offset"] >= 0
+    )
+
+
+def read_program(input_file: str) -> List[List[Instruction]]:
+    """
+    Reads the ALU program as blocks of instructions, one per `inp w`,
+    leaving the `inp` itself out of each block.
+    """
+    blocks: List[List[Instruction]] = []
+    with open(input_file) as f:
+        for line in f:
+            instruction = tuple(line.split())
+            if not instruction:
+                continue
+            if instruction[0] == "inp":
+                if instruction[1] != "w":
+                    raise ValueError(f"Only `inp w` is supported: {line}")
+                blocks.append([])
+            elif not blocks:
+                raise ValueError("The program must start with `inp w`.")
+            else:
+                blocks[-1].append(instruction)
+    return blocks
+
+
+@dataclass(frozen=True)
+class Block:
+    """
+    A compiled block: kernel(w, z) returns z after the block for arrays
+    of w and z. z_divisor is the product of its `div z N` instructions.
+    only_divides_z is set when the block has the MONAD shape in which
+    nothing but that division can make z smaller.
+    """
+
+    kernel: Callable[[np.ndarray, np.ndarray], np.ndarray]
+    source: str
+    z_divisor: int
+    only_divides_z: bool = False
+
+
+def compile_block(block: Sequence[Instruction]) -> Block:
+    """
+    Compiles a block into a numpy kernel. Registers with a value known
+    at compile time are folded away (`mul x 0`, `add x z` onto a zero,
+    `div z 1` ...), so the kernel only does the array work the block
+    really needs. x and y must be set before they are read, since only
+    w and z are passed in.
+    """
+    known: Dict[str, Optional[int]] = {"w": None, "z": None}
+    lines: List[str] = []
+    z_divisor = 1
+
+    def operand(token: str) -> Union[int, str]:
+        if token not in REGISTERS:
+            return int(token)
+        if token not in known:
+            raise ValueError(f"Block reads {token} before setting it.")
+        return token if known[token] is None else known[token]
+
+    for op, a, b in block:
+        if op not in _KERNEL_OPS:
+            raise ValueError(f"Unknown instruction {op}.")
+        if op == "div" and a == "z" and b not in REGISTERS:
+            z_divisor *= int(b)
+        right = operand(b)
+        if op == "mul" and right == 0:
+            known[a] = 0
+            continue
+        line = _fold(op, a, operand(a), right, known)
+        if line:
+            lines.append(line)
+
+    if known["z"] is not None:
+        lines.append(f"z = np.full_like(w, {known['z']})")
+    lines.append("return z")
+    source = "\n".join(["def kernel(w, z):"] + [f"    {x}" for x in lines])
+    namespace = {"np": np, "_div": _div, "_eql": _eql}
+    exec(compile(source, "<alu block>", "exec"), namespace)
+    return Block(
+        namespace["kernel"], source, z_divisor, _only_divides_z(block)
+    )
+
+
+def run(blocks: Sequence[Block], digits: Sequence[int]) -> int:
+    """Runs the compiled program on one model number; returns z."""
+    z = np.zeros(1, dtype=np.int64)
+    for block, digit in zip(blocks, digits):
+        z = block.kernel(np.full(1, digit, dtype=np.int64), z)
+    return int(z[0])
+
+
+def _best_per_z(
+    z: np.ndarray, largest: np.ndarray, smallest: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns the distinct z values with the largest and the smallest
+    prefix that reaches each.
+    """
+    order = np.lexsort((largest, z))
+    z, largest, smallest = z[order], largest[order], smallest[order]
+    starts = np.flatnonzero(np.r_[True, z[1:] != z[:-1]])
+    ends = np.r_[starts[1:], len(z)] - 1
+    return z[starts], largest[ends], np.minimum.reduceat(smallest, starts)
+
+
+def search(blocks: Sequence[Block]) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Returns the largest and smallest model numbers the program accepts
+    (z == 0 at the end), or None if there are none.
+
+    The frontier holds each distinct z reached so far with the largest
+    and the smallest prefix reaching it. Any prefix reaching the same z
+    behaves the same from there, so nothing else is worth keeping. Each
+    block runs every z against all nine digits at once.
+
+    When every block still to come has the MONAD shape, z is only ever
+    made smaller by `div z N`, so a z that is not below the product of
+    those divisors can never get back to 0 and is dropped, as is a
+    negative z (the ALU cannot take `mod` of one). Unlike a fixed cutoff
+    this loses no solutions. Before any other block nothing is dropped.
+    """
+    # remaining[i]: the product of the divisors of blocks i onwards, or
+    # None if one of them can make z smaller some other way.
+    remaining: List[Optional[int]] = [1] * (len(blocks) + 1)
+    for i in range(len(blocks) - 1, -1, -1):
+        if remaining[i + 1] is None or not blocks[i].only_divides_z:
+            remaining[i] = None
+        else:
+            remaining[i] = remaining[i + 1] * blocks[i].z_divisor
+
+    z = np.zeros(1, dtype=np.int64)
+    largest = np.zeros(1, dtype=np.int64)
+    smallest = np.zeros(1, dtype=np.int64)
+    for i, block in enumerate(blocks):
+        w = np.tile(DIGITS, len(z))
+        z = block.kernel(w, np.repeat(z, 9))
+        largest = np.repeat(largest, 9) * 10 + w
+        smallest = np.repeat(smallest, 9) * 10 + w
+        if remaining[i + 1] is not None:
+            viable = (z >= 0) & (z < remaining[i + 1])
+            if not viable.any():
+                return None, None
+            z, largest, smallest = z[viable], largest[viable], smallest[viable]
+        z, largest, smallest = _best_per_z(z, largest, smallest)
+        metrics.observe("day_24.frontier", len(z))
+
+    accepted = np.flatnonzero(z == 0)
+    if not len(accepted):
+        return None, None
+    return int(largest[accepted[0]]), int(smallest[accepted[0]])
+
+
+def part_1(input_file: str = input_location(day=24)) -> int:
+    """The largest model number MONAD accepts."""
+    blocks = [compile_block(block) for block in read_program(input_file)]
+    return search(blocks)[0]
+
+
+def part_2(input_file: str = input_location(day=24)) -> int:
+    """The smallest model number MONAD accepts."""
+    blocks = [compile_block(block) for block in read_program(input_file)]
+    return search(blocks)[1]
@@ -0,0 +1,135 @@
+"""
+Advent of Code 2021 - Day 25: Sea Cucumber
+https://adventofcode.com/2021/day/25
+
+The sea floor is a uint8 grid, and each herd's move is a handful of
+whole-grid mask operations.
+"""
+
+from __future__ import annotations
+from typing import Iterable, Optional, Tuple
+import numpy as np
+from advent_of_code import metrics
+from advent_of_code.utils import input_location
+
+EMPTY, EAST, SOUTH = 0, 1, 2
+_CODES = {".": EMPTY, ">": EAST, "v": SOUTH}
+_SYMBOLS = np.array([".", ">", "v"])
+
+
+def _roll_into(out: np.ndarray, a: np.ndarray, shift: int, axis: int):
+    """
+    Writes np.roll(a, shift, axis) into out for a shift of 1 or -1,
+    reusing out instead of allocating a new grid.
+    """
+    n = a.shape[axis]
+
+    def part(start, stop):
+        index = [slice(None), slice(None)]
+        index[axis] = slice(start, stop)
+        return tuple(index)
+
+    if shift == 1:
+        out[part(1, n)] = a[part(0, n - 1)]
+        out[part(0, 1)] = a[part(n - 1, n)]
+    else:
+        out[part(0, n - 1)] = a[part(1, n)]
+        out[part(n - 1, n)] = a[part(0, 1)]
+
+
+class SeaFloor(object):
+    """
+    The sea floor as a uint8 grid of EMPTY, EAST and SOUTH. The three
+    boolean buffers a move needs are allocated once, so stepping a
+    floor allocates nothing grid-sized.
+    """
+
+    def __init__(self, grid: np.ndarray):
+        self.grid = np.array(grid, dtype=np.uint8)
+        self._herd = np.empty(self.grid.shape, dtype=bool)
+        self._free = np.empty(self.grid.shape, dtype=bool)
+        self._shifted = np.empty(self.grid.shape, dtype=bool)
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str]) -> SeaFloor:
+        rows = [line.rstrip() for line in lines if line.strip()]
+        return cls(np.array([[_CODES[c] for c in row] for row in rows]))
+
+    @classmethod
+    def from_file(cls, input_file: str) -> SeaFloor:
+        with open(input_file) as f:
+            return cls.from_lines(f)
+
+    @classmethod
+    def random(
+        cls, shape: Tuple[int, int], density: float = 0.5, seed: int = 0
+    ) -> SeaFloor:
+        """A floor with each cell a cucumber (either herd) at density."""
+        rng = np.random.default_rng(seed)
+        grid = rng.integers(EAST, SOUTH + 1, size=shape, dtype=np.uint8)
+        threshold = round(density * 256)
+        grid *= rng.integers(0, 256, size=shape, dtype=np.uint8) < threshold
+        return cls(grid)
+
+    def __repr__(self) -> str:
+        return "".join("".join(row) + "\n" for row in _SYMBOLS[self.grid])
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, SeaFloor):
+            return NotImplemented
+        return np.array_equal(self.grid, other.grid)
+
+    def _move(self, herd: int, axis: int) -> int:
+        """
+        Moves every cucumber of herd whose next cell along axis is
+        empty, all at once. Returns how many moved.
+        """
+        grid = self.grid
+        np.equal(grid, EMPTY, out=self._free)
+        _roll_into(self._shifted, self._free, -1, axis)
+        movers = np.equal(grid, herd, out=self._herd)
+        movers &= self._shifted
+        moved = int(np.count_nonzero(movers))
+        if moved:
+            # as uint8, movers is 1 where a cucumber leaves: scale it to
+            # the herd's code, take it off and add it back one cell on.
+            # (Plain ufuncs; masked assignment is several times slower.)
+            leaving = movers.view(np.uint8)
+            leaving *= herd
+            grid -= leaving
+            arriving = self._shifted.view(np.uint8)
+            _roll_into(arriving, leaving, 1, axis)
+            grid += arriving
+        return moved
+
+    def move_east_herd(self) -> int:
+        """Moves the east-facing herd; returns how many moved."""
+        return self._move(EAST, axis=1)
+
+    def move_south_herd(self) -> int:
+        """Moves the south-facing herd; returns how many moved."""
+        return self._move(SOUTH, axis=0)
+
+    def step(self) -> int:
+        """Moves both herds; returns how many cucumbers moved."""
+        return self.move_east_herd() + self.move_south_herd()
+
+    def steps_until_stable(self, max_steps: Optional[int] = None) -> int:
+        """
+        Steps until nothing moves and returns the number of that step
+        (the puzzle's answer). The check is the movers' count, so no
+        copy of the grid is kept to compare against. Raises
+        RuntimeError if the floor still moves after max_steps.
+        """
+        steps = 0
+        while max_steps is None or steps < max_steps:
+            steps += 1
+            if not self.step():
+                metrics.count("day_25.steps", steps)
+                return steps
+        raise RuntimeError(f"Still moving after {max_steps} steps.")
+
+
+def part_1(input_file: str = input_location(day=25)) -> int:
+    """The first step on which no sea cucumbers move."""
+    return SeaFloor.from_file(input_file).steps_until_stable()
@@ -0,0 +1,59 @@
+"""
+Import-time benchmark for the package.
+
+    python -m advent_of_code.import_benchmark [--repeat N]
+
+Each statement is timed in a fresh interpreter, so nothing is already
+in sys.modules, and the median of the runs is reported in milliseconds
+next to the bare interpreter start-up it includes.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+STATEMENTS = {
+    "python startup": "pass",
+    "import advent_of_code": "import advent_of_code",
+    "utils.input_location": (
+        "from advent_of_code.utils import input_location"
+    ),
+    "advent_of_code.input_location": (
+        "import advent_of_code; advent_of_code.input_location"
+    ),
+    "advent_of_code.Packet": "import advent_of_code; advent_of_code.Packet",
+    "advent_of_code.Cube": "import advent_of_code; advent_of_code.Cube",
+    "every day module": (
+        "import advent_of_code as a; "
+        "[a.FrozenDict, a.Packet, a.SailFishNumber, a.Player, a.Cube]"
+    ),
+}
+
+
+def time_statement(statement: str, repeat: int = 5) -> float:
+    """Returns the median wall time of running statement in a new python."""
+    timings: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], check=True)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def run(repeat: int = 5) -> Dict[str, float]:
+    """Returns the median milliseconds for each of STATEMENTS."""
+    return {
+        label: time_statement(statement, repeat) * 1000
+        for label, statement in STATEMENTS.items()
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    for label, millis in run(args.repeat).items():
+        print(f"{label:<32} {millis:8.1f} ms")
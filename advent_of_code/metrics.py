@@ -0,0 +1,163 @@
+"""
+Counters, timers and histograms for the day modules' hot paths.
+
+Nothing is recorded unless a collect() block is open, and every hook
+returns straight away when none is, so instrumented code costs one
+truthiness check per hook when disabled. Hot loops keep their tallies
+in local variables and report them once per call.
+
+    with metrics.collect() as report:
+        day_18.part_1()
+    print(report.format())
+"""
+
+from __future__ import annotations
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterator, List
+import math
+import time
+
+# every open collect() block, outermost first; all of them record.
+_reports: List[Report] = []
+_DISABLED = nullcontext()
+
+
+class Histogram(object):
+    """
+    Count, sum, min and max of observed values, plus a count per power
+    of two bucket: bucket e holds values in [2 ** (e - 1), 2 ** e), and
+    bucket None holds zeros and negatives.
+    """
+
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self.buckets: Counter = Counter()
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        self.buckets[math.frexp(value)[1] if value > 0 else None] += 1
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else math.nan
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+            "mean": self.mean,
+            "buckets": {
+                "<=0" if e is None else f"<2^{e}": n
+                for e, n in sorted(
+                    self.buckets.items(),
+                    key=lambda item: -math.inf if item[0] is None else item[0],
+                )
+            },
+        }
+
+
+class Report(object):
+    """What was recorded while a collect() block was open."""
+
+    def __init__(self):
+        self.counters: Counter = Counter()
+        self.timers: Dict[str, Histogram] = {}
+        self.histograms: Dict[str, Histogram] = {}
+
+    def as_dict(self) -> dict:
+        return {
+            "counters": dict(sorted(self.counters.items())),
+            "timers": {
+                name: h.as_dict() for name, h in sorted(self.timers.items())
+            },
+            "histograms": {
+                name: h.as_dict()
+                for name, h in sorted(self.histograms.items())
+            },
+        }
+
+    def format(self) -> str:
+        """Renders the report as one line per name."""
+        lines = [
+            f"{name:<32} {n:>12}" for name, n in sorted(self.counters.items())
+        ]
+        for name, h in sorted(self.timers.items()):
+            lines.append(
+                f"{name:<32} {h.count:>12} calls {h.total:.6f}s "
+                f"(max {h.max:.6f}s)"
+            )
+        for name, h in sorted(self.histograms.items()):
+            lines.append(
+                f"{name:<32} {h.count:>12} obs mean {h.mean:.3g} "
+                f"min {h.min} max {h.max}"
+            )
+        return "\n".join(lines)
+
+
+def enabled() -> bool:
+    """True while a collect() block is open."""
+    return bool(_reports)
+
+
+def count(name: str, n: int = 1):
+    """Adds n to the counter name."""
+    if _reports:
+        for report in _reports:
+            report.counters[name] += n
+
+
+def observe(name: str, value):
+    """Adds value to the histogram name."""
+    if _reports:
+        for report in _reports:
+            histogram = report.histograms.get(name)
+            if histogram is None:
+                histogram = report.histograms[name] = Histogram()
+            histogram.add(value)
+
+
+def _record_time(name: str, seconds: float):
+    for report in _reports:
+        histogram = report.timers.get(name)
+        if histogram is None:
+            histogram = report.timers[name] = Histogram()
+        histogram.add(seconds)
+
+
+@contextmanager
+def _timing(name: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record_time(name, time.perf_counter() - start)
+
+
+def timer(name: str):
+    """
+    Returns a context manager timing its block into the timer name, or
+    a shared no-op one when nothing is being collected.
+    """
+    return _timing(name) if _reports else _DISABLED
+
+
+@contextmanager
+def collect() -> Iterator[Report]:
+    """Records every hook fired inside the block into a fresh Report."""
+    report = Report()
+    _reports.append(report)
+    try:
+        yield report
+    finally:
+        _reports.remove(report)
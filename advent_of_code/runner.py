@@ -0,0 +1,143 @@
+"""
+Runs the packaged day solvers headless and measures them.
+
+A day module takes part when it defines part_1 and/or part_2 callables
+that need no arguments (their defaults point at data/day_N/input.txt,
+so run from the repository root). Every part runs in its own worker
+process, so the peak RSS reported is that part's alone.
+"""
+
+from __future__ import annotations
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+import importlib
+import json
+import multiprocessing
+import pkgutil
+import re
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+import advent_of_code
+from advent_of_code import metrics
+
+PARTS = ("part_1", "part_2")
+
+
+@dataclass(frozen=True)
+class PartResult:
+    """The answer and cost of running one part of one day."""
+
+    day: int
+    part: int
+    answer: Optional[str]
+    wall_seconds: float
+    cpu_seconds: float
+    peak_rss_mb: Optional[float]
+    error: Optional[str] = None
+    metrics: Optional[dict] = None
+
+
+def discover_days() -> Dict[int, str]:
+    """Returns {day: module name} for every day_N module in the package."""
+    days = {}
+    for module in pkgutil.iter_modules(advent_of_code.__path__):
+        match = re.fullmatch(r"day_(\d+)", module.name)
+        if match:
+            days[int(match.group(1))] = f"advent_of_code.{module.name}"
+    return dict(sorted(days.items()))
+
+
+def solvers(days: Optional[Iterable[int]] = None) -> List[Tuple[int, int]]:
+    """Returns the (day, part) pairs that have a solver."""
+    available = discover_days()
+    found = []
+    for day in available if days is None else days:
+        if day not in available:
+            raise ValueError(f"No module for day {day}.")
+        module = importlib.import_module(available[day])
+        for part, name in enumerate(PARTS, start=1):
+            if callable(getattr(module, name, None)):
+                found.append((day, part))
+    return found
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process, in MB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux and the BSDs KB.
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / (1 << 10)
+
+
+def run_part(day: int, part: int) -> PartResult:
+    """
+    Runs one part in this process and measures it, collecting what the
+    day's metrics hooks record.
+    """
+    module = importlib.import_module(discover_days()[day])
+    solve = getattr(module, PARTS[part - 1])
+    wall, cpu = time.perf_counter(), time.process_time()
+    answer, error = None, None
+    with metrics.collect() as report:
+        try:
+            answer = str(solve())
+        except Exception as err:  # reported rather than stopping the run
+            error = f"{type(err).__name__}: {err}"
+    return PartResult(
+        day,
+        part,
+        answer,
+        time.perf_counter() - wall,
+        time.process_time() - cpu,
+        _peak_rss_mb(),
+        error,
+        report.as_dict(),
+    )
+
+
+def run(
+    days: Optional[Iterable[int]] = None, jobs: Optional[int] = None
+) -> List[PartResult]:
+    """
+    Runs every part of the given days (all days by default) over a pool
+    of jobs worker processes, each part in a fresh process.
+    """
+    tasks = solvers(days)
+    # a multiprocessing Pool rather than a ProcessPoolExecutor, whose
+    # max_tasks_per_child needs Python 3.11.
+    with multiprocessing.Pool(processes=jobs, maxtasksperchild=1) as pool:
+        return pool.starmap(run_part, tasks, chunksize=1)
+
+
+def format_table(results: List[PartResult], show_metrics: bool = False) -> str:
+    """
+    Renders results as a fixed-width table, optionally followed by each
+    part's counters.
+    """
+    lines = [
+        f"{'day':>3} {'part':>4} {'wall s':>9} {'cpu s':>9} "
+        f"{'peak MB':>8}  answer"
+    ]
+    for r in results:
+        rss = "-" if r.peak_rss_mb is None else f"{r.peak_rss_mb:8.1f}"
+        lines.append(
+            f"{r.day:>3} {r.part:>4} {r.wall_seconds:>9.3f} "
+            f"{r.cpu_seconds:>9.3f} {rss:>8}  "
+            f"{r.answer if r.error is None else 'ERROR ' + r.error}"
+        )
+        if show_metrics and r.metrics:
+            for name, n in r.metrics["counters"].items():
+                lines.append(f"{'':>8} {name:<34} {n:>12}")
+    return "\n".join(lines)
+
+
+def format_json(results: List[PartResult]) -> str:
+    """Renders results as a JSON list of objects."""
+    return json.dumps([asdict(r) for r in results], indent=2)
@@ -1,8 +1,32 @@
 """
 Simple utilities that could be used by the notebooks across the entire event.
 """
+
+from __future__ import annotations
 import os
 
+# Every day module imports input_location from here, so this module
+# imports nothing else at load time: the loader and parsers import what
+# they need when called, and the typing names are for annotations only.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import (
+        IO,
+        Any,
+        Callable,
+        Iterator,
+        List,
+        Optional,
+        Sequence,
+        Tuple,
+        Union,
+    )
+
+# where load_input keeps parsed results; override with AOC_CACHE_DIR.
+CACHE_DIR = os.environ.get("AOC_CACHE_DIR", os.path.join("data", ".cache"))
+# part of every cache key: bump it to drop everything cached before.
+CACHE_VERSION = 2
+
 
 def test_input_location(day: int, filename: str = "test_input.txt") -> str:
     """returns location of test file"""
@@ -17,7 +41,9 @@ def input_location(day: int, filename: str = "input.txt") -> str:
 def hex_to_binary(hex: str) -> str:
     """
     Converts a hexidecimal number to the string reppresentation
-    of the binary equivalent.
+    of the binary equivalent. The result is 8 characters per input
+    byte; bits_at/BitCursor read the same bits from bytes.fromhex(hex)
+    without building it.
     """
     return format(int(hex, 16), f"0>{len(hex*4)}b")
 
@@ -25,3 +51,309 @@ def hex_to_binary(hex: str) -> str:
 def bin_to_dec(binary: str) -> int:
     """convert binary to decimal."""
     return int(binary, 2)
+
+
+def bits_at(buf, offset: int, width: int) -> int:
+    """
+    Returns the `width` bits starting `offset` bits into a bytes-like
+    buffer, read big-endian, as an int. Only the bytes spanning the
+    field are touched, so this is the bytes equivalent of
+    bin_to_dec(hex_to_binary(hex)[offset:offset + width]).
+    """
+    end = offset + width
+    first, last = offset >> 3, (end + 7) >> 3
+    if last > len(buf):
+        raise EOFError(f"Cannot read {width} bits at offset {offset}.")
+    chunk = int.from_bytes(buf[first:last], "big")
+    return (chunk >> ((last << 3) - end)) & ((1 << width) - 1)
+
+
+def iter_hex_chunks(
+    source: Union[str, IO], chunk_size: int = 1 << 16
+) -> Iterator[Tuple[bytes, int]]:
+    """
+    Decodes hexidecimal text (a string or a text/binary stream) a chunk
+    at a time. Yields (data, bit_count) pairs: whitespace is skipped, an
+    odd digit is carried into the next chunk, and a final odd digit is
+    padded to a byte with bit_count saying how many bits are real.
+    """
+    if isinstance(source, str):
+        starts = range(0, len(source), chunk_size)
+        chunks = (source[i : i + chunk_size] for i in starts)
+    else:
+        chunks = iter(lambda: source.read(chunk_size), source.read(0))
+
+    nibble = ""
+    for text in chunks:
+        if isinstance(text, bytes):
+            text = text.decode("ascii")
+        hex = nibble + "".join(text.split())
+        whole = len(hex) - len(hex) % 2
+        hex, nibble = hex[:whole], hex[whole:]
+        if hex:
+            yield bytes.fromhex(hex), len(hex) * 4
+    if nibble:
+        yield bytes.fromhex(nibble + "0"), 4
+
+
+class BitCursor(object):
+    """
+    Reads big-endian bit fields out of a bytes-like buffer without
+    ever building the '0'/'1' string. The cursor only remembers its
+    position, so slicing the transmission is a matter of moving `pos`.
+    """
+
+    def __init__(self, buf, bit_length: int = None, pos: int = 0):
+        self.buf = memoryview(buf).cast("B")
+        self.bit_length = (
+            len(self.buf) * 8 if bit_length is None else bit_length
+        )
+        self.pos = pos
+
+    @classmethod
+    def from_hex(cls, hex: str) -> "BitCursor":
+        """Builds a cursor over a hexidecimal string."""
+        hex = hex.strip()
+        padded = hex + "0" if len(hex) % 2 else hex
+        return cls(bytes.fromhex(padded), len(hex) * 4)
+
+    @classmethod
+    def from_bits(cls, binary: str) -> "BitCursor":
+        """Builds a cursor over a '0'/'1' string (legacy input)."""
+        if not binary:
+            return cls(b"", 0)
+        pad = -len(binary) % 8
+        value = int(binary, 2) << pad
+        size = (len(binary) + pad) // 8
+        return cls(value.to_bytes(size, "big"), len(binary))
+
+    def remaining(self) -> int:
+        """Returns the number of unread bits."""
+        return self.bit_length - self.pos
+
+    def field(self, start: int, width: int) -> int:
+        """Returns the `width` bits at absolute bit offset `start`."""
+        if start + width > self.bit_length:
+            raise EOFError(f"Cannot read {width} bits at offset {start}.")
+        return bits_at(self.buf, start, width)
+
+    def peek(self, width: int, offset: int = 0) -> int:
+        """Returns `width` bits starting `offset` bits past pos."""
+        return self.field(self.pos + offset, width)
+
+    def read(self, width: int) -> int:
+        """Returns the next `width` bits as an int and advances."""
+        value = self.peek(width)
+        self.pos += width
+        return value
+
+    def bits(self, start: int, end: int) -> str:
+        """Returns bits [start, end) as a '0'/'1' string."""
+        if end <= start:
+            return ""
+        return format(self.field(start, end - start), f"0{end - start}b")
+
+
+class HexStreamReader(object):
+    """
+    Reads big-endian bit fields from a stream of hexidecimal digits,
+    decoding `chunk_size` characters at a time with iter_hex_chunks.
+    Only the current chunk is held in memory; `pos` counts the bits
+    consumed from the stream.
+    """
+
+    def __init__(self, stream, chunk_size: int = 1 << 16):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.pos = 0
+        self._cursor = BitCursor(b"", 0)
+        self._chunks = iter_hex_chunks(stream, chunk_size)
+
+    def _refill(self, width: int):
+        """Decodes chunks until at least `width` bits are buffered."""
+        while self._cursor.remaining() < width:
+            extra, extra_bits = next(self._chunks, (None, 0))
+            if extra is None:
+                raise EOFError(f"Cannot read {width} bits at {self.pos}.")
+
+            # keep the unread tail of the old chunk, from its first byte.
+            cursor = self._cursor
+            first = cursor.pos >> 3
+            self._cursor = BitCursor(
+                bytes(cursor.buf[first:]) + extra,
+                cursor.bit_length - first * 8 + extra_bits,
+                cursor.pos - first * 8,
+            )
+
+    def read(self, width: int) -> int:
+        """Returns the next `width` bits as an int and advances."""
+        self._refill(width)
+        self.pos += width
+        return self._cursor.read(width)
+
+
+def parse_lines(data) -> List[str]:
+    """Returns the non-blank lines, stripped."""
+    return [
+        line.strip()
+        for line in bytes(data).decode().splitlines()
+        if line.strip()
+    ]
+
+
+def parse_int_columns(data) -> List[List[int]]:
+    """
+    Returns whitespace separated integers as columns, e.g. a file with
+    one number per line is a single column.
+    """
+    rows = [line.split() for line in bytes(data).splitlines() if line.strip()]
+    return [list(map(int, column)) for column in zip(*rows)]
+
+
+def parse_comma_ints(data) -> List[int]:
+    """Returns a comma separated list of integers."""
+    return [int(x) for x in bytes(data).split(b",") if x.strip()]
+
+
+def parse_digit_grid(data):
+    """
+    Returns a grid of single digits as a numpy uint8 array. When every
+    row has the same length the buffer is reshaped where it lies rather
+    than split into lines.
+    """
+    import numpy as np
+
+    end = len(data)
+    while end and chr(data[end - 1]).isspace():
+        end -= 1
+    width = data.find(b"\n")
+    if width > 0 and (end + 1) % (width + 1) == 0:
+        rows = (end + 1) // (width + 1)
+        raw = np.frombuffer(data, dtype=np.uint8, count=end)
+        if len(data) > end:
+            raw = np.frombuffer(data, dtype=np.uint8, count=end + 1)
+        else:
+            raw = np.append(raw, np.uint8(ord("\n")))
+        grid = raw.reshape(rows, width + 1)
+        if (grid[:, -1] == ord("\n")).all():
+            return grid[:, :width] - ord("0")
+    lines = bytes(data).split()
+    return np.array([list(line) for line in lines], dtype=np.uint8) - ord("0")
+
+
+def parse_regex_records(
+    data, pattern: str, types: Optional[Sequence[Callable]] = None
+) -> List[tuple]:
+    """
+    Returns the groups of every match of pattern, converted by types
+    (one callable per group) if given.
+    """
+    import re
+
+    matches = re.findall(pattern, bytes(data).decode(), flags=re.MULTILINE)
+    records = [m if isinstance(m, tuple) else (m,) for m in matches]
+    if types is None:
+        return records
+    return [tuple(t(v) for t, v in zip(types, record)) for record in records]
+
+
+PARSERS = {
+    "lines": parse_lines,
+    "int_columns": parse_int_columns,
+    "comma_ints": parse_comma_ints,
+    "digit_grid": parse_digit_grid,
+    "regex_records": parse_regex_records,
+}
+
+
+def _hash_code(code, h) -> None:
+    """Feeds a code object, and the code nested in it, into hash h."""
+    h.update(code.co_code)
+    h.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if hasattr(const, "co_code"):
+            _hash_code(const, h)
+        else:
+            h.update(repr(const).encode())
+
+
+def _parser_key(parser: Callable) -> Optional[str]:
+    """
+    Identifies a parser by its name and a hash of its code, so an edited
+    parser, or another lambda, gets its own cache entries. Returns None
+    for parsers that cannot be identified that way: closures, whose
+    results depend on the values they close over, and callables that
+    are not plain functions.
+    """
+    code = getattr(parser, "__code__", None)
+    if code is None or getattr(parser, "__closure__", None):
+        return None
+    import hashlib
+
+    h = hashlib.sha256()
+    _hash_code(code, h)
+    return f"{parser.__module__}.{parser.__qualname__}:{h.hexdigest()}"
+
+
+def _cache_path(digest: str, parser_key: str, kwargs: dict) -> str:
+    """The cache file for this content, parser and parser arguments."""
+    import hashlib
+
+    key = hashlib.sha256(
+        f"{CACHE_VERSION}:{digest}:{parser_key}:"
+        f"{sorted(kwargs.items())!r}".encode()
+    ).hexdigest()
+    return os.path.join(CACHE_DIR, f"{key}.pickle")
+
+
+def load_input(
+    day: int,
+    parser: Union[str, Callable] = "lines",
+    filename: str = "input.txt",
+    cache: bool = True,
+    cache_key: Optional[str] = None,
+    **kwargs,
+) -> Any:
+    """
+    Parses data/day_N/filename with one of PARSERS (or any callable
+    taking the file's buffer and kwargs).
+
+    The file is memory-mapped, hashed, and the parsed result is pickled
+    under CACHE_DIR keyed by that hash, the parser and its arguments, so
+    re-runs and parallel workers load it back instead of parsing. Cache
+    files are written atomically, so concurrent writers are harmless.
+
+    A parser is told apart by its name and code. Closures and other
+    callables are only cached under an explicit cache_key, which must
+    then change whenever their output would.
+    """
+    import hashlib
+    import mmap
+    import pickle
+    import tempfile
+
+    parse = PARSERS[parser] if isinstance(parser, str) else parser
+    if cache_key is None:
+        cache_key = _parser_key(parse)
+        cache = cache and cache_key is not None
+    path = os.path.join(f"data/day_{day}", filename)
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return parse(b"", **kwargs)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if not cache:
+                return parse(data, **kwargs)
+            cached = _cache_path(
+                hashlib.sha256(data).hexdigest(), cache_key, kwargs
+            )
+            if os.path.exists(cached):
+                with open(cached, "rb") as c:
+                    return pickle.load(c)
+            result = parse(data, **kwargs)
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+    with os.fdopen(fd, "wb") as c:
+        pickle.dump(result, c, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, cached)
+    return result
@@ -0,0 +1,88 @@
+"""
+Compares the day 22 engines on the real reboot steps and on random ones.
+
+    python -m benchmarks.compare_22 [--time-limit SECONDS]
+
+Inclusion-exclusion needs about two minutes on the full 420 step input
+and grows without bound on the random inputs, so it also runs on the
+bounded part 1 steps, and the real input gets a longer time limit than
+the random ones.
+"""
+
+import argparse
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+from advent_of_code import utils
+from advent_of_code.day_22 import (
+    Cube,
+    count_on_disjoint,
+    count_on_inclusion_exclusion,
+    count_on_vectorized,
+    read_cubes,
+)
+from benchmarks.generators import random_reboot_steps
+
+ENGINES = {
+    "disjoint": count_on_disjoint,
+    "vectorized": count_on_vectorized,
+    "inclusion_exclusion": count_on_inclusion_exclusion,
+}
+
+
+def _with_deadline(cubes: Iterable[Cube], seconds: float) -> Iterator[Cube]:
+    """Yields the cubes, raising TimeoutError once seconds have passed."""
+    deadline = time.perf_counter() + seconds
+    for c in cubes:
+        if time.perf_counter() > deadline:
+            raise TimeoutError
+        yield c
+
+
+def compare_engines(
+    inputs: Dict[str, List[Cube]],
+    engines: Optional[Dict[str, Callable[[Iterable[Cube]], int]]] = None,
+    time_limit: float = 60.0,
+) -> List[dict]:
+    """
+    Times every engine on every input. An engine that runs past
+    time_limit seconds on an input is stopped and reported with a
+    seconds of None, since inclusion-exclusion can grow without bound.
+    """
+    results = []
+    for input_name, cubes in inputs.items():
+        for engine_name, engine in (engines or ENGINES).items():
+            start = time.perf_counter()
+            try:
+                count = engine(_with_deadline(cubes, time_limit))
+                seconds = time.perf_counter() - start
+            except TimeoutError:
+                count, seconds = None, None
+            results.append(
+                {
+                    "input": input_name,
+                    "steps": len(cubes),
+                    "engine": engine_name,
+                    "count": count,
+                    "seconds": seconds,
+                }
+            )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--time-limit", type=float, default=60.0)
+    args = parser.parse_args()
+    path = utils.input_location(day=22)
+    real = {
+        "part_1": read_cubes(path, bound=True),
+        "input": read_cubes(path),
+    }
+    synthetic = {
+        "random_10k": random_reboot_steps(10000),
+        "random_20k": random_reboot_steps(20000, seed=1),
+    }
+    rows = compare_engines(real, time_limit=max(600.0, args.time_limit))
+    rows += compare_engines(synthetic, time_limit=args.time_limit)
+    for row in rows:
+        print(row)
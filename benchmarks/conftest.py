@@ -0,0 +1,50 @@
+"""
+Benchmarks of the packaged hot paths, on the real inputs and on
+synthetic inputs scaled up from them (see generators.py). They are kept
+out of the default test run; run them with
+
+    python -m pytest benchmarks --benchmark-only --scales 1,10
+
+Scales 100 and 1000 are opt-in (--scales 1,10,100,1000) as the day 21
+and day 22 inputs grow faster than linearly in cost. Those benchmarks
+are capped with @pytest.mark.max_scale(100): at 1000x day 21's Dirac
+tables take about 3e10 updates and day 22's reboot runs for hours, so
+larger scales are skipped rather than run. Baselines live in
+benchmarks/baselines: save one with
+
+    python -m pytest benchmarks --benchmark-only \\
+        --benchmark-storage=benchmarks/baselines --benchmark-save=baseline
+
+and compare a change against it with
+
+    python -m pytest benchmarks --benchmark-only \\
+        --benchmark-storage=benchmarks/baselines \\
+        --benchmark-compare --benchmark-compare-fail=mean:25%
+"""
+
+from benchmarks.generators import SCALES
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--scales",
+        default="1,10",
+        help=f"comma separated input scale factors out of {SCALES}",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "max_scale(n): only run at scale factors up to n"
+    )
+
+
+def pytest_generate_tests(metafunc):
+    if "scale" in metafunc.fixturenames:
+        scales = [
+            int(s) for s in metafunc.config.getoption("scales").split(",")
+        ]
+        cap = metafunc.definition.get_closest_marker("max_scale")
+        if cap is not None:
+            scales = [s for s in scales if s <= cap.args[0]]
+        metafunc.parametrize("scale", scales, ids=lambda s: f"{s}x")
@@ -0,0 +1,228 @@
+"""
+Scale-up generators for the benchmarks. Each builds an input factor
+times the size of the real data/day_N/input.txt. Where the answer does
+not follow from the real one, a plain reference solver here works it
+out, so every benchmark can check it measured the right work.
+"""
+
+import itertools
+import random
+from functools import lru_cache
+from typing import List, Tuple
+import numpy as np
+from advent_of_code import utils
+from advent_of_code.day_14 import read_input
+from advent_of_code.day_16 import Packet
+from advent_of_code.day_21 import DiracRules
+from advent_of_code.day_22 import Cube, read_cubes
+
+SCALES = (1, 10, 100, 1000)
+
+# Operator packets holding a count of sub-packets store it in 11 bits.
+_MAX_SUB_PACKETS = (1 << 11) - 1
+
+
+def read_text(day: int) -> str:
+    with open(utils.input_location(day=day)) as f:
+        return f.read()
+
+
+def _sum_packet_bits(children: List[str]) -> str:
+    """Bits of a version 0 sum packet (type 0) over the children."""
+    return (
+        "000" + "000" + "1" + format(len(children), "011b") + "".join(children)
+    )
+
+
+@lru_cache(maxsize=None)
+def day_16_hex(factor: int) -> str:
+    """
+    A transmission summing factor copies of the real packet (nested when
+    factor outgrows one packet's sub-packet count), so its value is
+    factor times the real one.
+    """
+    real = read_text(16).strip()
+    bits = utils.hex_to_binary(real)[: Packet.from_hex(real).length()]
+    packets = [bits] * factor
+    while True:
+        packets = [
+            _sum_packet_bits(packets[i : i + _MAX_SUB_PACKETS])  # noqa: E203
+            for i in range(0, len(packets), _MAX_SUB_PACKETS)
+        ]
+        if len(packets) == 1:
+            break
+    bits = packets[0] + "0" * (-len(packets[0]) % 8)
+    return format(int(bits, 2), f"0{len(bits) // 4}X")
+
+
+def day_18_lines(factor: int, seed: int = 0) -> List[str]:
+    """The real snailfish numbers repeated factor times, shuffled."""
+    lines = read_text(18).split()
+    if factor == 1:
+        return lines
+    lines = lines * factor
+    random.Random(seed).shuffle(lines)
+    return lines
+
+
+def _snail_flat(line: str) -> List[List[int]]:
+    """A snailfish number as [value, depth] for each regular number."""
+    flat, depth = [], 0
+    for c in line:
+        if c == "[":
+            depth += 1
+        elif c == "]":
+            depth -= 1
+        elif c.isdigit():
+            flat.append([int(c), depth])
+    return flat
+
+
+def _snail_reduce(flat: List[List[int]]) -> List[List[int]]:
+    while True:
+        i = next((i for i, (_, d) in enumerate(flat) if d > 4), None)
+        if i is not None:
+            (left, d), (right, _) = flat[i], flat[i + 1]
+            if i > 0:
+                flat[i - 1][0] += left
+            if i + 2 < len(flat):
+                flat[i + 2][0] += right
+            flat[i : i + 2] = [[0, d - 1]]  # noqa: E203
+            continue
+        i = next((i for i, (v, _) in enumerate(flat) if v >= 10), None)
+        if i is None:
+            return flat
+        v, d = flat[i]
+        flat[i : i + 1] = [[v // 2, d + 1], [v - v // 2, d + 1]]  # noqa: E203
+
+
+def _snail_magnitude(flat: List[List[int]]) -> int:
+    flat = [list(x) for x in flat]
+    while len(flat) > 1:
+        deepest = max(d for _, d in flat)
+        i = next(i for i, (_, d) in enumerate(flat) if d == deepest)
+        flat[i : i + 2] = [  # noqa: E203
+            [3 * flat[i][0] + 2 * flat[i + 1][0], deepest - 1]
+        ]
+    return flat[0][0]
+
+
+@lru_cache(maxsize=None)
+def day_18_magnitude(factor: int, seed: int = 0) -> int:
+    """
+    The magnitude of the sum of day_18_lines(factor, seed), worked out
+    on flat [value, depth] lists rather than SailFishNumbers.
+    """
+    lines = day_18_lines(factor, seed)
+    total = _snail_flat(lines[0])
+    for line in lines[1:]:
+        total = [[v, d + 1] for v, d in total + _snail_flat(line)]
+        total = _snail_reduce(total)
+    return _snail_magnitude(total)
+
+
+def day_14_input(factor: int) -> Tuple[str, dict]:
+    """The real rules with the polymer template repeated factor times."""
+    polymer, rules = read_input(utils.input_location(day=14))
+    return polymer * factor, rules
+
+
+def day_21_rules(factor: int) -> DiracRules:
+    """Dirac dice played to factor times the winning score."""
+    return DiracRules(winning_score=DiracRules().winning_score * factor)
+
+
+def _dirac_turns(start: int, rules: DiracRules) -> Tuple[list, list]:
+    """
+    One player alone, turn by turn on a (position, score) table of
+    exact counts. Returns (won, alive) per turn, as day_21's
+    turn_outcomes does.
+    """
+    board, target = rules.board_size, rules.winning_score
+    faces = range(1, rules.die_faces + 1)
+    rolls: dict = {}
+    for faces_rolled in itertools.product(faces, repeat=rules.rolls_per_turn):
+        rolls[sum(faces_rolled)] = rolls.get(sum(faces_rolled), 0) + 1
+    table = np.zeros((board, target), dtype=object)
+    table[start - 1, 0] = 1
+    won, alive = [0], [1]
+    while alive[-1]:
+        moved = np.zeros((board, target), dtype=object)
+        for total, universes in rolls.items():
+            moved += np.roll(table, total, axis=0) * universes
+        table = np.zeros((board, target), dtype=object)
+        won.append(0)
+        for position in range(board):
+            gain = min(position + 1, target)
+            short = target - gain  # scores that stay short of the target
+            table[position, gain:] = moved[position, :short]
+            won[-1] += moved[position, short:].sum()
+        alive.append(table.sum())
+    return won, alive
+
+
+@lru_cache(maxsize=None)
+def day_21_wins(
+    factor: int, p1_start: int = 7, p2_start: int = 9
+) -> Tuple[int, int]:
+    """
+    The universes each player wins in under day_21_rules(factor). Like
+    dirac_wins it costs about factor squared, so it is cached.
+    """
+    rules = day_21_rules(factor)
+    won_1, alive_1 = _dirac_turns(p1_start, rules)
+    won_2, alive_2 = _dirac_turns(p2_start, rules)
+    # player 1 wins on turn t where player 2 survived t - 1 turns, and
+    # player 2 on turn t where player 1 survived t. alive ends at 0.
+    p1 = sum(
+        w * alive_2[min(t - 1, len(alive_2) - 1)]
+        for t, w in enumerate(won_1)
+        if t
+    )
+    p2 = sum(
+        w * alive_1[min(t, len(alive_1) - 1)] for t, w in enumerate(won_2)
+    )
+    return int(p1), int(p2)
+
+
+def day_22_cubes(factor: int) -> List[Cube]:
+    """
+    factor copies of the real reboot steps, each shifted along x clear
+    of the others, so as many cores are on as factor times the real
+    count.
+    """
+    cubes = read_cubes(utils.input_location(day=22))
+    low = min(c.xmin for c in cubes)
+    width = max(c.xmax for c in cubes) - low + 1
+    return [
+        Cube(
+            c.add,
+            c.xmin + k * width,
+            c.xmax + k * width,
+            c.ymin,
+            c.ymax,
+            c.zmin,
+            c.zmax,
+        )
+        for k in range(factor)
+        for c in cubes
+    ]
+
+
+def random_reboot_steps(
+    n: int,
+    seed: int = 0,
+    extent: int = 100000,
+    max_size: int = 20000,
+    on_ratio: float = 0.6,
+) -> List[Cube]:
+    """Returns n random day 22 reboot steps inside +/- extent on each axis."""
+    rng = random.Random(seed)
+    cubes: List[Cube] = []
+    for _ in range(n):
+        bounds = []
+        for _ in range(3):
+            low = rng.randint(-extent, extent - 1)
+            bounds += [low, min(extent, low + rng.randint(0, max_size))]
+        cubes.append(Cube(rng.random() < on_ratio, *bounds))
+    return cubes
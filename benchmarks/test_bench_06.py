@@ -0,0 +1,25 @@
+"""
+day 6 benchmarks.
+"""
+
+import pytest
+from advent_of_code import utils
+from advent_of_code.day_06 import (
+    Population,
+    advance_by_matrix,
+    age_histogram,
+    read_input,
+)
+
+
+@pytest.mark.parametrize("days", [256, 10**4, 10**6])
+def test_advance(benchmark, days):
+    counts = age_histogram(read_input(utils.input_location(day=6)))
+    population = benchmark(lambda: Population(counts).advance(days))
+    assert population.total() > 0
+
+
+@pytest.mark.parametrize("days", [256, 10**4])
+def test_matrix(benchmark, days):
+    counts = age_histogram(read_input(utils.input_location(day=6)))
+    assert sum(benchmark(advance_by_matrix, counts, days)) > 0
@@ -0,0 +1,19 @@
+"""
+day 11 benchmarks.
+"""
+
+import pytest
+from advent_of_code import utils
+from advent_of_code.day_11 import OctopusGrid
+
+
+def test_count_flashes(benchmark):
+    path = utils.input_location(day=11)
+    flashes = benchmark(lambda: OctopusGrid.from_file(path).count_flashes(100))
+    assert flashes > 0
+
+
+@pytest.mark.parametrize("side", [256, 1024, 4096])
+def test_step(benchmark, side):
+    grid = OctopusGrid.random((side, side))
+    assert benchmark.pedantic(grid.step, rounds=5, iterations=1) > 0
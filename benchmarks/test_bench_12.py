@@ -0,0 +1,31 @@
+"""
+day 12 benchmarks.
+"""
+
+import pytest
+from itertools import combinations
+from advent_of_code import utils
+from advent_of_code.day_12 import CaveGraph
+
+
+def complete_graph(small: int) -> CaveGraph:
+    """start, end and small caves all joined to each other and to A."""
+    caves = ["start", "end", "A"] + [f"c{i}" for i in range(small)]
+    return CaveGraph.from_edges(combinations(caves, 2))
+
+
+@pytest.mark.parametrize("revisit", [False, True])
+def test_count_paths(benchmark, revisit):
+    graph = CaveGraph.from_file(utils.input_location(day=12))
+    assert benchmark(graph.count_paths, revisit) > 0
+
+
+def test_iter_paths(benchmark):
+    graph = CaveGraph.from_file(utils.input_location(day=12))
+    assert benchmark(lambda: sum(1 for _ in graph.iter_paths(True))) > 0
+
+
+@pytest.mark.parametrize("small", [8, 12])
+def test_count_paths_complete(benchmark, small):
+    graph = complete_graph(small)
+    assert benchmark(graph.count_paths, True) > 0
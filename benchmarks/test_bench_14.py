@@ -0,0 +1,14 @@
+"""
+day 14 benchmarks.
+"""
+
+from advent_of_code.day_14 import PairTransitions
+from benchmarks.generators import day_14_input
+
+
+def test_element_counts(benchmark, scale):
+    polymer, rules = day_14_input(scale)
+    counts = benchmark(
+        lambda: PairTransitions(rules).element_counts(polymer, 40)
+    )
+    assert sum(counts.values()) == (len(polymer) - 1) * 2**40 + 1
@@ -0,0 +1,16 @@
+"""
+day 15 benchmarks.
+"""
+
+import pytest
+from advent_of_code import utils
+from advent_of_code.day_15 import lowest_risk_path, read_cave
+
+
+@pytest.mark.parametrize("factor", [1, 5, 50])
+def test_lowest_risk_path(benchmark, factor):
+    cave = read_cave(utils.input_location(day=15))
+    result = benchmark.pedantic(
+        lowest_risk_path, (cave, factor), rounds=3, iterations=1
+    )
+    assert result.cost > 0
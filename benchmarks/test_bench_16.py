@@ -0,0 +1,29 @@
+"""
+day 16 benchmarks.
+"""
+
+from advent_of_code.day_16 import Packet, compile_events, evaluate_stream
+from advent_of_code.utils import BitCursor
+from benchmarks.generators import day_16_hex
+
+VALUE = 2536453523344
+
+
+def test_packet_parse(benchmark, scale):
+    hex = day_16_hex(scale)
+    packet = benchmark(Packet.from_hex, hex)
+    assert packet.evaluate() == scale * VALUE
+
+
+def test_evaluate_stream(benchmark, scale):
+    hex = day_16_hex(scale)
+    result = benchmark(lambda: evaluate_stream(BitCursor.from_hex(hex)))
+    assert result.value == scale * VALUE
+
+
+def test_compile_and_evaluate(benchmark, scale):
+    hex = day_16_hex(scale)
+    value = benchmark(
+        lambda: compile_events(BitCursor.from_hex(hex)).evaluate()
+    )
+    assert value == scale * VALUE
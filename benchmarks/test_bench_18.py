@@ -0,0 +1,25 @@
+"""
+day 18 benchmarks.
+"""
+
+from functools import reduce
+from advent_of_code.day_18 import str2sailfishnumber
+from benchmarks.generators import day_18_lines, day_18_magnitude
+
+
+def test_sum(benchmark, scale):
+    numbers = [str2sailfishnumber(line) for line in day_18_lines(scale)]
+    total = benchmark(reduce, lambda a, b: a.add(b), numbers)
+    assert total.magnitude() == day_18_magnitude(scale)
+
+
+def test_magnitude(benchmark, scale):
+    numbers = [str2sailfishnumber(line) for line in day_18_lines(scale)]
+    magnitudes = benchmark(lambda: [n.magnitude() for n in numbers])
+    assert len(magnitudes) == len(numbers)
+
+
+def test_parse(benchmark, scale):
+    lines = day_18_lines(scale)
+    numbers = benchmark(lambda: [str2sailfishnumber(line) for line in lines])
+    assert len(numbers) == len(lines)
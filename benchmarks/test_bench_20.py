@@ -0,0 +1,18 @@
+"""
+day 20 benchmarks.
+"""
+
+import pytest
+from advent_of_code import utils
+from advent_of_code.day_20 import read_input
+
+
+@pytest.mark.parametrize("steps", [50, 500])
+def test_enhance_many(benchmark, steps):
+    def run():
+        algo, image = read_input(utils.input_location(day=20))
+        image.enhance_many(algo, steps)
+        return image
+
+    image = benchmark.pedantic(run, rounds=3, iterations=1)
+    assert image.pixels.shape == (100 + 2 * steps, 100 + 2 * steps)
@@ -0,0 +1,20 @@
+"""
+day 21 benchmarks.
+"""
+
+import pytest
+from advent_of_code.day_21 import dirac_wins, fast_forward
+from benchmarks.generators import day_21_rules, day_21_wins
+
+
+@pytest.mark.max_scale(100)
+def test_dirac_wins(benchmark, scale):
+    wins = benchmark(dirac_wins, 7, 9, day_21_rules(scale))
+    assert wins == day_21_wins(scale)
+    if scale == 1:
+        assert max(wins) == 433315766324816
+
+
+def test_fast_forward(benchmark, scale):
+    result = benchmark(fast_forward, 7, 9, winning_score=1000 * scale)
+    assert result.losing_score() < 1000 * scale
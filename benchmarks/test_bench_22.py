@@ -0,0 +1,50 @@
+"""
+day 22 benchmarks.
+"""
+
+import pytest
+from advent_of_code import utils
+from advent_of_code.day_22 import (
+    count_on_disjoint,
+    count_on_inclusion_exclusion,
+    count_on_vectorized,
+    read_cubes,
+)
+from benchmarks.generators import day_22_cubes
+
+PART_1 = 590467
+COUNT = 1225064738333321
+
+
+@pytest.mark.max_scale(100)
+def test_count_on_disjoint(benchmark, scale):
+    cubes = day_22_cubes(scale)
+    assert benchmark(count_on_disjoint, cubes) == scale * COUNT
+
+
+def test_inclusion_exclusion_part_1(benchmark):
+    cubes = read_cubes(utils.input_location(day=22), bound=True)
+    count = benchmark.pedantic(
+        count_on_inclusion_exclusion, (cubes,), rounds=3, iterations=1
+    )
+    assert count == PART_1
+
+
+def test_vectorized(benchmark):
+    # real input only: the signed cubes grow with every step, so 10x
+    # takes about two minutes a round.
+    cubes = day_22_cubes(1)
+    count = benchmark.pedantic(
+        count_on_vectorized, (cubes,), rounds=3, iterations=1
+    )
+    assert count == COUNT
+
+
+def test_intersections(benchmark):
+    cubes = day_22_cubes(1)
+    pairs = benchmark(
+        lambda: sum(
+            1 for a in cubes for b in cubes if a.intersection(b) is not None
+        )
+    )
+    assert pairs >= len(cubes)
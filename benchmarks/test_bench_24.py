@@ -0,0 +1,18 @@
+"""
+day 24 benchmarks.
+"""
+
+from advent_of_code import utils
+from advent_of_code.day_24 import compile_block, read_program, search
+
+
+def test_compile(benchmark):
+    program = read_program(utils.input_location(day=24))
+    blocks = benchmark(lambda: [compile_block(block) for block in program])
+    assert len(blocks) == 14
+
+
+def test_search(benchmark):
+    program = read_program(utils.input_location(day=24))
+    blocks = [compile_block(block) for block in program]
+    assert benchmark(search, blocks) == (95299897999897, 31111121382151)
@@ -0,0 +1,24 @@
+"""
+day 25 benchmarks.
+"""
+
+import pytest
+from advent_of_code import utils
+from advent_of_code.day_25 import SeaFloor
+
+
+def test_steps_until_stable(benchmark):
+    def fresh_floor():
+        return (SeaFloor.from_file(utils.input_location(day=25)),), {}
+
+    steps = benchmark.pedantic(
+        SeaFloor.steps_until_stable, setup=fresh_floor, rounds=5
+    )
+    assert steps == 507
+
+
+@pytest.mark.parametrize("side", [1000, 10000])
+def test_step(benchmark, side):
+    floor = SeaFloor.random((side, side))
+    moved = benchmark.pedantic(floor.step, rounds=3, iterations=1)
+    assert moved > 0
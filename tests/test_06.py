@@ -0,0 +1,75 @@
+"""
+day 6 tests.
+"""
+
+import pytest
+from advent_of_code.day_06 import (
+    LanternFish,
+    Population,
+    School,
+    advance_by_matrix,
+    age_histogram,
+    count_fish,
+    read_input,
+)
+from advent_of_code import utils
+
+
+def simulate(timers, days):
+    """One LanternFish object per fish, as the notebook first did."""
+    fish = [LanternFish(init_counter=timer) for timer in timers]
+    for _ in range(days):
+        fish += [baby for baby in (f.day_older() for f in fish) if baby]
+    return fish
+
+
+def test_read_input():
+    assert read_input(utils.test_input_location(day=6)) == [3, 4, 3, 1, 2]
+
+
+def test_examples():
+    fish = read_input(utils.test_input_location(day=6))
+    assert count_fish(fish, 18) == 26
+    assert count_fish(fish, 80) == 5934
+    assert count_fish(fish, 256) == 26984457539
+
+
+@pytest.mark.parametrize("days", [0, 1, 7, 9, 30])
+def test_histogram_matches_objects(days):
+    fish = [3, 4, 3, 1, 2, 0, 8, 6]
+    expected = age_histogram(f.counter for f in simulate(fish, days))
+    assert Population.from_fish(fish).advance(days).histogram() == expected
+    assert advance_by_matrix(age_histogram(fish), days) == expected
+
+
+@pytest.mark.parametrize("days", [2047, 2048, 5000])
+def test_rotation_and_matrix_agree(days):
+    population = Population.from_fish([3, 4, 3, 1, 2])
+    for _ in range(days):
+        population.day()
+    counts = age_histogram([3, 4, 3, 1, 2])
+    assert population.histogram() == advance_by_matrix(counts, days)
+    assert Population(counts).advance(days).total() == population.total()
+
+
+def test_population_requires_nine_counts():
+    with pytest.raises(ValueError):
+        Population([1, 2, 3])
+
+
+def test_school_wrapper():
+    school = School(school_init=[3, 4, 3, 1, 2])
+    for day in range(1, 19):
+        school.day()
+    assert school.count_fish() == 26
+    assert sorted(f.counter for f in school.fish) == sorted(
+        f.counter for f in simulate([3, 4, 3, 1, 2], 18)
+    )
+    school.days(256 - 18)
+    assert school.count_fish() == 26984457539
+
+
+def test_real_input():
+    fish = read_input(utils.input_location(day=6))
+    assert count_fish(fish, 80) == 352872
+    assert count_fish(fish, 256) == 1604361182149
@@ -0,0 +1,107 @@
+"""
+day 11 tests.
+"""
+
+import numpy as np
+import pytest
+from advent_of_code.day_11 import Cave, Octopus, OctopusGrid, part_1, part_2
+from advent_of_code import utils
+
+
+def reference_step(grid):
+    """One step on Octopus objects, as the notebook's Cave did."""
+    height, width = len(grid), len(grid[0])
+    flashes = [o for row in grid for o in row if o.increment_energy()]
+    total = len(flashes)
+    while flashes:
+        new_flashes = []
+        for o in flashes:
+            for r in range(max(o.row - 1, 0), min(o.row + 2, height)):
+                for c in range(max(o.col - 1, 0), min(o.col + 2, width)):
+                    if grid[r][c].increment_energy():
+                        new_flashes.append(grid[r][c])
+        total += len(new_flashes)
+        flashes = new_flashes
+    for row in grid:
+        for o in row:
+            o.flashed_this_round = False
+    return total
+
+
+def test_octopus():
+    o = Octopus(1, 1, 8)
+    assert not o.increment_energy()
+    assert o.energy_level == 9
+    assert o.increment_energy()
+    assert not o.increment_energy()
+    assert o.energy_level == 0 and o.flashed_this_round
+    o.engergy_level = 4  # the notebook's spelling
+    assert o.energy_level == o.engergy_level == 4
+
+
+def test_small_example():
+    grid = OctopusGrid.from_lines(
+        ["11111", "19991", "19191", "19991", "11111"]
+    )
+    assert grid.step() == 9
+    assert repr(grid) == "34543\n40004\n50005\n40004\n34543\n"
+    assert grid.step() == 0
+    assert repr(grid) == "45654\n51115\n61116\n51115\n45654\n"
+
+
+def test_example():
+    assert part_1(utils.test_input_location(day=11), steps=10) == 204
+    assert part_1(utils.test_input_location(day=11)) == 1656
+    assert part_2(utils.test_input_location(day=11)) == 195
+
+
+@pytest.mark.parametrize("shape", [(1, 1), (1, 7), (6, 1), (13, 17)])
+def test_matches_reference(shape):
+    grid = OctopusGrid.random(shape, seed=sum(shape))
+    octopuses = [
+        [Octopus(r, c, int(level)) for c, level in enumerate(row)]
+        for r, row in enumerate(grid.energy)
+    ]
+    for _ in range(30):
+        assert grid.step() == reference_step(octopuses)
+        levels = [[o.energy_level for o in row] for row in octopuses]
+        assert np.array_equal(grid.energy, levels)
+
+
+def test_cave():
+    cave = Cave(utils.test_input_location(day=11))
+    assert cave.num_octopuses() == 100
+    assert (
+        cave.grid[0][0] == Octopus(0, 0) and cave.grid[0][0].energy_level == 5
+    )
+    assert cave.step() == (0, False)
+    assert cave.step() == (35, False)
+
+
+def test_cave_one_octopus():
+    cave = Cave(utils.test_input_location(day=11))
+    cave.octopuses.energy[0, 0] = 8
+    assert cave.increment_energy_level_at(0, 0) is False
+    assert cave.grid[0][0].engergy_level == 9
+    assert cave.increment_energy_level_at(0, 0) is True
+    assert cave.increment_energy_level_at(0, 0) is False
+    assert cave.grid[0][0].energy_level == 0
+    assert cave.grid[0][0].flashed_this_round
+    assert cave.increment_energy_level_at(-1, 0) is None
+    assert cave.increment_energy_level_at(0, 10) is None
+    cave.reset_flashes()
+    assert not cave.grid[0][0].flashed_this_round
+    assert cave.increment_energy_level_at(0, 0) is False
+    assert cave.grid[0][0].energy_level == 1
+
+
+def test_steps_until_synchronized_limit():
+    with pytest.raises(RuntimeError):
+        OctopusGrid.from_file(
+            utils.test_input_location(day=11)
+        ).steps_until_synchronized(max_steps=100)
+
+
+def test_parts():
+    assert part_1() == 1588
+    assert part_2() == 517
@@ -0,0 +1,73 @@
+"""
+day 12 tests.
+"""
+
+import pytest
+from advent_of_code.day_12 import CaveGraph, part_1, part_2
+from advent_of_code import utils
+
+EXAMPLES = [
+    ("test_input.txt", 10, 36),
+    ("test_slightly_longer.txt", 19, 103),
+    ("test_even_longer.txt", 226, 3509),
+]
+
+
+def walk(graph, path, revisit):
+    """Every path onwards from path, as the notebook's drunken walk."""
+    cave = path[-1]
+    if cave == "end":
+        return [path]
+    paths = []
+    for n in graph.adjacency[graph.index[cave]]:
+        name = graph.names[n]
+        if name.isupper() or name not in path:
+            paths += walk(graph, path + [name], revisit)
+        elif revisit:
+            paths += walk(graph, path + [name], False)
+    return paths
+
+
+@pytest.mark.parametrize("filename, paths, paths_revisit", EXAMPLES)
+def test_count_paths(filename, paths, paths_revisit):
+    graph = CaveGraph.from_file(utils.test_input_location(12, filename))
+    assert graph.count_paths() == paths
+    assert graph.count_paths(allow_revisit=True) == paths_revisit
+
+
+@pytest.mark.parametrize("filename, paths, paths_revisit", EXAMPLES)
+@pytest.mark.parametrize("revisit", [False, True])
+def test_iter_paths(filename, paths, paths_revisit, revisit):
+    graph = CaveGraph.from_file(utils.test_input_location(12, filename))
+    found = list(graph.iter_paths(allow_revisit=revisit))
+    assert len(found) == (paths_revisit if revisit else paths)
+    assert sorted(found) == sorted(walk(graph, ["start"], revisit))
+
+
+def test_iter_paths_is_lazy():
+    graph = CaveGraph.from_file(utils.input_location(day=12))
+    paths = graph.iter_paths(allow_revisit=True)
+    assert next(paths)[0] == "start"
+    assert next(paths)[-1] == "end"
+
+
+def test_graph():
+    graph = CaveGraph.from_file(utils.test_input_location(day=12))
+    assert graph.names == ["start", "A", "b", "c", "d", "end"]
+    assert graph.is_small(graph.index["b"])
+    assert not graph.is_small(graph.index["A"])
+    # no cave leads back to start
+    assert all(graph.start not in joined for joined in graph.adjacency)
+    assert list(graph.adjacency[graph.index["d"]]) == [graph.index["b"]]
+
+
+def test_bad_graphs():
+    with pytest.raises(ValueError):
+        CaveGraph.from_edges([("start", "A"), ("A", "B"), ("B", "end")])
+    with pytest.raises(ValueError):
+        CaveGraph.from_edges([("start", "a")])
+
+
+def test_parts():
+    assert part_1() == 3761
+    assert part_2() == 99138
@@ -0,0 +1,84 @@
+"""
+day 14 tests.
+"""
+
+from collections import Counter
+import pickle
+import numpy as np
+import pytest
+from advent_of_code import utils
+from advent_of_code.day_14 import FrozenDict, PairTransitions, read_input
+
+
+def spread(counts: Counter) -> int:
+    """Most common element count minus the least common."""
+    return counts.most_common()[0][1] - counts.most_common()[-1][1]
+
+
+@pytest.fixture
+def example():
+    return read_input(utils.test_input_location(day=14))
+
+
+def test_element_counts(example):
+    """Element counts for the expansions given in the puzzle."""
+    polymer, rules = example
+    transitions = PairTransitions(rules)
+    assert transitions.element_counts(polymer, 0) == Counter(polymer)
+    assert transitions.element_counts(polymer, 1) == Counter("NCNBCHB")
+    assert transitions.element_counts(polymer, 2) == Counter("NBCCNBBBCBHCB")
+    assert transitions.element_counts(polymer, 4) == Counter(
+        "NBBNBNBBCCNBCNCCNBBNBBNBBBNBBNBBCBHCBHHNHCBBCBHCB"
+    )
+    assert spread(transitions.element_counts(polymer, 10)) == 1588
+    assert spread(transitions.element_counts(polymer, 40)) == 2188189693529
+
+
+def test_exact_beyond_uint64(example):
+    """Object dtype keeps counts exact once they outgrow uint64."""
+    polymer, rules = example
+    transitions = PairTransitions(rules)
+    counts = transitions.element_counts(polymer, 300)
+    assert sum(counts.values()) == (len(polymer) - 1) * 2**300 + 1
+
+
+@pytest.mark.parametrize("steps", [0, 1, 7, 100, 129, 1000])
+def test_advance_matches_power(example, steps):
+    """Carrying the vector through the squarings equals the full power."""
+    _, rules = example
+    transitions = PairTransitions(rules)
+    vector = np.arange(len(transitions.pairs), dtype=object)
+    assert (
+        transitions.advance(vector, steps).tolist()
+        == (transitions.power(steps) @ vector).tolist()
+    )
+
+
+def test_unknown_elements(example):
+    """Elements without rules just sit in the polymer."""
+    _, rules = example
+    transitions = PairTransitions(rules)
+    assert transitions.element_counts("NNXCB", 1) == Counter("NCNXCHB")
+
+
+def test_frozen_dict_immutable():
+    """FrozenDict cannot be changed once built."""
+    frozen = FrozenDict({"CH": "B", "HH": "N"})
+    with pytest.raises(TypeError):
+        frozen["CH"] = "C"
+    with pytest.raises(TypeError):
+        frozen._d["CH"] = "C"
+    with pytest.raises(AttributeError):
+        frozen._hash = 0
+    assert frozen == {"CH": "B", "HH": "N"}
+    assert pickle.loads(pickle.dumps(frozen)) == frozen
+
+
+def test_frozen_dict_hash_and_intern():
+    """Equal FrozenDicts hash alike; interned ones are one object."""
+    a = FrozenDict({"CH": "B", "HH": "N"})
+    b = FrozenDict(HH="N", CH="B")
+    assert a == b and hash(a) == hash(b) and a is not b
+    assert a != FrozenDict({"CH": "B"})
+    assert FrozenDict.intern(a) is FrozenDict.intern(b)
+    assert FrozenDict.intern(a) is not FrozenDict.intern({"CH": "B"})
@@ -0,0 +1,79 @@
+"""
+day 15 tests.
+"""
+
+import heapq
+import numpy as np
+import pytest
+from advent_of_code.day_15 import TiledCave, lowest_risk_path, read_cave
+from advent_of_code import utils
+
+
+def dijkstra(cave: np.ndarray) -> int:
+    """Textbook heap Dijkstra over the expanded cave."""
+    rows, cols = cave.shape
+    dist = {(0, 0): 0}
+    queue = [(0, 0, 0)]
+    while queue:
+        d, r, c = heapq.heappop(queue)
+        if (r, c) == (rows - 1, cols - 1):
+            return d
+        if d > dist[(r, c)]:
+            continue
+        for nr, nc in ((r + 1, c), (r - 1, c), (r, c + 1), (r, c - 1)):
+            if 0 <= nr < rows and 0 <= nc < cols:
+                nd = d + int(cave[nr, nc])
+                if nd < dist.get((nr, nc), nd + 1):
+                    dist[(nr, nc)] = nd
+                    heapq.heappush(queue, (nd, nr, nc))
+
+
+def test_tiling():
+    cave = TiledCave(read_cave(utils.test_input_location(day=15)), 5)
+    full = cave.expand()
+    assert full.shape == (50, 50)
+    assert full[0, 49] == 6  # width completion
+    assert full[8, 12] == 1  # rollover
+    assert full[49, 49] == 9  # height completion
+    cells = np.array([0, 49, 8 * 50 + 12, 2499])
+    assert cave.risk_at(cells).tolist() == full.ravel()[cells].tolist()
+
+
+def test_examples():
+    cave = read_cave(utils.test_input_location(day=15))
+    assert lowest_risk_path(cave).cost == 40
+    assert lowest_risk_path(cave, factor=5).cost == 315
+
+
+def test_path():
+    cave = read_cave(utils.test_input_location(day=15))
+    result = lowest_risk_path(cave, factor=5, with_path=True)
+    full = TiledCave(cave, 5).expand()
+    assert result.path[0] == (0, 0)
+    assert result.path[-1] == (49, 49)
+    for (r1, c1), (r2, c2) in zip(result.path, result.path[1:]):
+        assert abs(r1 - r2) + abs(c1 - c2) == 1
+    assert sum(int(full[cell]) for cell in result.path[1:]) == result.cost
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_caves(seed):
+    rng = np.random.default_rng(seed)
+    cave = rng.integers(
+        1, 10, size=rng.integers(1, 30, size=2), dtype=np.uint8
+    )
+    for factor in (1, 3):
+        expected = dijkstra(TiledCave(cave, factor).expand())
+        assert lowest_risk_path(cave, factor).cost == expected
+
+
+def test_start_and_end():
+    cave = np.array([[1, 9, 1], [1, 9, 1], [1, 1, 1]], dtype=np.uint8)
+    assert lowest_risk_path(cave, start=(0, 2), end=(0, 0)).cost == 6
+    assert lowest_risk_path(cave, end=(0, 0)).cost == 0
+
+
+def test_real_input():
+    cave = read_cave(utils.input_location(day=15))
+    assert lowest_risk_path(cave).cost == 720
+    assert lowest_risk_path(cave, factor=5).cost == 3025
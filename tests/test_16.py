@@ -0,0 +1,190 @@
+"""
+day 16 tests.
+"""
+
+import io
+import pytest
+from advent_of_code.day_16 import (
+    EventKind,
+    InvalidPacketError,
+    LiteralPacket,
+    OperatorPacket,
+    PUSH,
+    Packet,
+    compile_events,
+    evaluate_file,
+    evaluate_hex,
+    evaluate_stream,
+    iter_packet_events,
+)
+from advent_of_code.utils import (
+    BitCursor,
+    HexStreamReader,
+    hex_to_binary,
+    input_location,
+)
+
+VALUE_EXAMPLES = [
+    ("C200B40A82", 3),
+    ("04005AC33890", 54),
+    ("880086C3E88112", 7),
+    ("CE00C43D881120", 9),
+    ("D8005AC2A8F0", 1),
+    ("F600BC2D8F", 0),
+    ("9C005AC2F8F0", 0),
+    ("9C0141080250320F1802104A08", 1),
+]
+
+
+def nested_hex(depth: int) -> str:
+    """An operator chain `depth` deep (length type 1) around a literal."""
+    bits = ("001" + "000" + "1" + format(1, "011b")) * depth
+    bits += "110" + "100" + "00101"
+    bits += "0" * (-len(bits) % 4)
+    return format(int(bits, 2), f"0{len(bits) // 4}X")
+
+
+def test_literal():
+    """Literal packet from the puzzle description."""
+    p1 = Packet(hex_to_binary("D2FE28"))
+    assert isinstance(p1, LiteralPacket)
+    assert p1.header.version == 6
+    assert p1.value == "2021"
+    assert p1.length() == len(hex_to_binary("D2FE28")) - 3
+    assert p1.data_bits == "101111111000101"
+    assert p1.compute_value_from_bits() == "2021"
+
+
+def test_operator_length_type_0():
+    """Operator packet whose length is given in bits."""
+    p2 = Packet(hex_to_binary("38006F45291200"))
+    assert isinstance(p2, OperatorPacket)
+    assert p2.header.version == 1
+    assert p2.header.type_id == 6
+    assert p2.operator_info.length_type_id == 0
+    assert [sp.value for sp in p2.sub_packets] == ["10", "20"]
+    assert [sp.length() for sp in p2.sub_packets] == [11, 16]
+    assert p2.data_bits == hex_to_binary("38006F45291200")[22:49]
+
+
+def test_operator_length_type_1():
+    """Operator packet whose length is given in sub-packets."""
+    p3 = Packet(hex_to_binary("EE00D40C823060"))
+    assert isinstance(p3, OperatorPacket)
+    assert p3.header.version == 7
+    assert p3.header.type_id == 3
+    assert [sp.value for sp in p3.sub_packets] == ["1", "2", "3"]
+
+
+@pytest.mark.parametrize(
+    "hex,expected",
+    [
+        ("8A004A801A8002F478", 16),
+        ("620080001611562C8802118E34", 12),
+        ("C0015000016115A2E0802F182340", 23),
+        ("A0016C880162017C3686B18A3D4780", 31),
+    ],
+)
+def test_sum_of_version_numbers(hex, expected):
+    """Version sums from the puzzle description."""
+    assert Packet(hex_to_binary(hex)).sum_of_version_numbers() == expected
+    assert Packet.from_hex(hex).sum_of_version_numbers() == expected
+    assert (
+        Packet.from_buffer(bytes.fromhex(hex)).sum_of_version_numbers()
+        == expected
+    )
+
+
+def test_cursor_matches_string_parse():
+    """Hex/bytes parsing gives the same tree as the string parse."""
+    with open(input_location(day=16)) as f:
+        hex = f.read().strip()
+    from_bits = Packet(hex_to_binary(hex))
+    from_hex = Packet.from_hex(hex)
+    assert repr(from_hex) == repr(from_bits)
+    assert from_hex.length() == from_bits.length()
+
+
+def test_cursor_position():
+    """The cursor is left just past the parsed packet."""
+    cursor = BitCursor.from_hex("D2FE28")
+    Packet(cursor)
+    assert cursor.pos == 21
+
+
+def test_too_small():
+    """Fewer than 11 bits cannot be a packet."""
+    with pytest.raises(InvalidPacketError):
+        Packet("1101001")
+
+
+def test_events():
+    """A literal inside a sum operator."""
+    cursor = BitCursor.from_hex("C200B40A82")
+    kinds = [e.kind for e in iter_packet_events(cursor)]
+    assert kinds == [
+        EventKind.HEADER,
+        EventKind.OPERATOR_BEGIN,
+        EventKind.HEADER,
+        EventKind.LITERAL,
+        EventKind.HEADER,
+        EventKind.LITERAL,
+        EventKind.OPERATOR_END,
+    ]
+
+
+@pytest.mark.parametrize("hex,expected", VALUE_EXAMPLES)
+def test_evaluate_stream(hex, expected):
+    """Operator values from the puzzle description."""
+    assert evaluate_stream(BitCursor.from_hex(hex)).value == expected
+    reader = HexStreamReader(io.StringIO(hex + "\n"), chunk_size=3)
+    assert evaluate_stream(reader).value == expected
+
+
+def test_evaluate_file():
+    """Streaming the real input agrees with the Packet tree."""
+    filename = input_location(day=16)
+    with open(filename) as f:
+        packet = Packet.from_hex(f.read())
+    for chunk_size in [1, 7, 1 << 16]:
+        result = evaluate_file(filename, chunk_size=chunk_size)
+        assert result.version_sum == packet.sum_of_version_numbers()
+    assert result.value == 2536453523344
+
+
+def test_deep_nesting():
+    """Nesting far beyond the recursion limit streams without error."""
+    result = evaluate_stream(BitCursor.from_hex(nested_hex(20000)))
+    assert result.version_sum == 20000 + 6
+    assert result.value == 5
+
+
+@pytest.mark.parametrize("hex,expected", VALUE_EXAMPLES)
+def test_compiled_program(hex, expected):
+    """Compiled trees and event streams evaluate to the same value."""
+    assert Packet.from_hex(hex).evaluate() == expected
+    assert compile_events(BitCursor.from_hex(hex)).evaluate() == expected
+    assert evaluate_hex(hex) == expected
+
+
+def test_compiled_program_layout():
+    """C200B40A82 is 1 + 2 in postfix."""
+    program = Packet.from_hex("C200B40A82").compile()
+    assert list(program.opcodes) == [PUSH, PUSH, 0]
+    assert list(program.operands) == [1, 2, 2]
+
+
+def test_compile_wide_literal():
+    """Literals wider than 64 bits go to the constants table."""
+    bits = "110" + "100" + "1" + "1111" + "11111" * 16 + "00001"
+    bits += "0" * (-len(bits) % 4)
+    hex = format(int(bits, 2), f"0{len(bits) // 4}X")
+    assert evaluate_hex(hex) == (1 << 72) - 15
+
+
+def test_evaluate_hex_cache():
+    """A repeated transmission is answered from the cache."""
+    evaluate_hex.cache_clear()
+    evaluate_hex("C200B40A82")
+    evaluate_hex("C200B40A82")
+    assert evaluate_hex.cache_info().hits == 1
@@ -4,7 +4,14 @@ day 18 tests.
 
 import pytest
 from functools import reduce
-from advent_of_code.day_18 import str2sailfishnumber
+from itertools import permutations
+from advent_of_code.day_18 import (
+    magnitude_of,
+    max_pair_magnitude,
+    reduce_in_place,
+    str2sailfishnumber,
+)
+from advent_of_code import utils
 
 
 def test_add():
@@ -118,3 +125,40 @@ def test_example2():
     )
 
     assert snailfish_num.magnitude() == 3488  # the answer.
+
+
+def test_reduce_in_place():
+    """Reduce the value/depth buffers of an unreduced sum directly."""
+    values, depths = str2sailfishnumber(
+        "[[[[[4,3],4],4],[7,[[8,4],9]]],[1,1]]"
+    ).to_arrays()
+    reduce_in_place(values, depths)
+    expected = str2sailfishnumber("[[[[0,7],4],[[7,8],[6,0]]],[8,1]]")
+    assert (values, depths) == expected.to_arrays()
+    assert magnitude_of(values, depths) == 1384
+
+
+def test_input():
+    """The full homework sum from the real input."""
+    with open(utils.input_location(day=18)) as f:
+        numbers = [str2sailfishnumber(line.strip()) for line in f]
+    assert reduce(lambda a, b: a + b, numbers).magnitude() == 4243
+
+
+def test_max_pair_magnitude():
+    """The pool search agrees with trying every pair one at a time."""
+    with open(utils.test_input_location(day=18)) as f:
+        numbers = [str2sailfishnumber(line.strip()) for line in f]
+    expected = max((a + b).magnitude() for a, b in permutations(numbers, 2))
+    assert max_pair_magnitude(numbers, max_workers=1) == expected
+    assert (
+        max_pair_magnitude(utils.test_input_location(day=18), max_workers=2)
+        == expected
+    )
+
+
+def test_reduce_in_place_floor():
+    """A sum that cannot beat the floor is abandoned."""
+    values, depths = str2sailfishnumber("[[1,2],[3,4]]").to_arrays()
+    assert not reduce_in_place(values, depths, floor=81 * 10)
+    assert reduce_in_place(values, depths, floor=81 * 10 - 1)
@@ -0,0 +1,80 @@
+"""
+day 20 tests.
+"""
+
+import numpy as np
+import pytest
+from advent_of_code.day_20 import Image, read_algorithm, read_input
+from advent_of_code import utils
+
+
+def enhance_set(lit: set, algo, background: int) -> set:
+    """The notebook's set-of-tuples step, for comparison."""
+    rows = [r for r, _ in lit] or [0]
+    cols = [c for _, c in lit] or [0]
+    top, bottom, left, right = min(rows), max(rows), min(cols), max(cols)
+    enhanced = set()
+    for r in range(top - 1, bottom + 2):
+        for c in range(left - 1, right + 2):
+            index = 0
+            for sr in range(r - 1, r + 2):
+                for sc in range(c - 1, c + 2):
+                    inside = top <= sr <= bottom and left <= sc <= right
+                    bit = int((sr, sc) in lit) if inside else background
+                    index = index * 2 + bit
+            if algo[index]:
+                enhanced.add((r, c))
+    return enhanced
+
+
+def test_read_algorithm():
+    assert read_algorithm("#." * 256).tolist() == [True, False] * 256
+    with pytest.raises(ValueError):
+        read_algorithm("#..#")
+
+
+def test_repr():
+    image = Image.from_lines(["#..", ".#.", ""])
+    assert repr(image) == "#..\n.#."
+    image.enhance(np.zeros(512, dtype=bool))
+    assert repr(image) == "\n".join(["....."] * 4)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_matches_set_image(seed):
+    rng = np.random.default_rng(seed)
+    algo = rng.random(512) < 0.5
+    algo[0], algo[511] = True, False  # the flipping background
+    pixels = rng.random((6, 7)) < 0.5
+    image = Image(pixels)
+    lit = set(zip(*np.nonzero(pixels)))
+    for step in range(4):
+        lit = enhance_set(lit, algo, step & 1)
+        image.enhance(algo)
+        assert image.background == bool(not step & 1)
+        if not image.background:
+            assert image.num_lit_pixels() == len(lit)
+    # the set keeps only lit pixels, so compare over its bounding box.
+    assert {(r - 4, c - 4) for r, c in zip(*np.nonzero(image.pixels))} == lit
+
+
+def test_background():
+    algo = np.zeros(512, dtype=bool)
+    algo[0] = True
+    image = Image(np.zeros((2, 2), dtype=bool))
+    image.enhance(algo)
+    assert image.background
+    assert image.num_lit_pixels() == float("inf")
+    # the notebook's override of the background going in.
+    image.enhance(algo, infinite_bit=0)
+    assert image.background
+    image.enhance(algo, infinite_bit=1)
+    assert not image.background
+
+
+def test_real_input():
+    algo, image = read_input(utils.input_location(day=20))
+    image.enhance_many(algo, 2)
+    assert image.num_lit_pixels() == 5249
+    image.enhance_many(algo, 48)
+    assert image.num_lit_pixels() == 15714
@@ -0,0 +1,114 @@
+"""
+day 21 tests.
+"""
+
+import itertools
+from functools import lru_cache
+import pytest
+from advent_of_code.day_21 import (
+    DeterministicDie,
+    DiracRules,
+    Player,
+    dirac_wins,
+    fast_forward,
+    roll_sum_frequencies,
+)
+
+
+def play_stepwise(p1_start, p2_start, winning_score, faces=100, board=10):
+    """Plays the deterministic game one roll at a time."""
+    players = [Player(p1_start), Player(p2_start)]
+    die = DeterministicDie()
+    turn = 0
+    while True:
+        total = 0
+        for _ in range(3):
+            face = die.roll()
+            # DeterministicDie is fixed at 100 faces.
+            total += face if faces == 100 else (die.roll_count - 1) % faces + 1
+        player = players[turn]
+        player.position = (player.position - 1 + total) % board + 1
+        player.score += player.position
+        if player.won_game(winning_score):
+            return (
+                (players[0].score, players[1].score),
+                die.roll_count,
+            )
+        turn = 1 - turn
+
+
+def test_roll_sum_frequencies():
+    """Three rolls of a three sided die."""
+    assert roll_sum_frequencies() == [
+        (3, 1),
+        (4, 3),
+        (5, 6),
+        (6, 7),
+        (7, 6),
+        (8, 3),
+        (9, 1),
+    ]
+
+
+def test_example():
+    """The Dirac dice example from the puzzle description."""
+    assert dirac_wins(4, 8) == (444356092776315, 341960390180808)
+
+
+@pytest.mark.parametrize(
+    "rules",
+    [
+        DiracRules(board_size=7, die_faces=2, rolls_per_turn=2),
+        DiracRules(board_size=10, die_faces=4, rolls_per_turn=1),
+        DiracRules(winning_score=12),
+    ],
+)
+def test_matches_recursion(rules):
+    """The tables agree with playing every universe out recursively."""
+
+    @lru_cache(maxsize=None)
+    def play(pos, score, other_pos, other_score):
+        wins, losses = 0, 0
+        faces = range(1, rules.die_faces + 1)
+        for rolls in itertools.product(faces, repeat=rules.rolls_per_turn):
+            new_pos = (pos + sum(rolls) - 1) % rules.board_size + 1
+            if score + new_pos >= rules.winning_score:
+                wins += 1
+            else:
+                other_wins, other_losses = play(
+                    other_pos, other_score, new_pos, score + new_pos
+                )
+                wins += other_losses
+                losses += other_wins
+        return wins, losses
+
+    for p1, p2 in [(1, 1), (4, 7), (7, 2)]:
+        assert dirac_wins(p1, p2, rules) == play(p1, 0, p2, 0)
+
+
+def test_fast_forward_example():
+    """The deterministic die example from the puzzle description."""
+    result = fast_forward(4, 8)
+    assert result.scores == (1000, 745)
+    assert result.roll_count == 993
+    assert result.losing_score() * result.roll_count == 739785
+
+
+@pytest.mark.parametrize("winning_score", [1, 50, 1000, 20000])
+@pytest.mark.parametrize("p1,p2", [(4, 8), (7, 9), (10, 10)])
+def test_fast_forward_matches_classes(p1, p2, winning_score):
+    """Fast forward agrees with DeterministicDie and Player."""
+    result = fast_forward(p1, p2, winning_score)
+    scores, roll_count = play_stepwise(p1, p2, winning_score)
+    assert (result.scores, result.roll_count) == (scores, roll_count)
+    assert all(1 <= p <= 10 for p in result.positions)
+
+
+@pytest.mark.parametrize("faces,board", [(6, 7), (1, 10), (2, 3), (17, 10)])
+def test_fast_forward_other_games(faces, board):
+    """Other die and board sizes, including dice rolled round in a turn."""
+    result = fast_forward(
+        3, 1, winning_score=5000, die_faces=faces, board_size=board
+    )
+    scores, roll_count = play_stepwise(3, 1, 5000, faces, board)
+    assert (result.scores, result.roll_count) == (scores, roll_count)
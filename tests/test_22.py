@@ -0,0 +1,149 @@
+"""
+day 22 tests.
+"""
+
+import itertools
+import pytest
+from advent_of_code import utils
+from advent_of_code.day_22 import (
+    BoxTree,
+    Cube,
+    CubeSet,
+    Reactor,
+    count_on_disjoint,
+    count_on_inclusion_exclusion,
+    count_on_vectorized,
+    read_cubes,
+    run_sequence,
+)
+from benchmarks.generators import random_reboot_steps
+
+SMALL_EXAMPLE = [
+    "on x=10..12,y=10..12,z=10..12",
+    "on x=11..13,y=11..13,z=11..13",
+    "off x=9..11,y=9..11,z=9..11",
+    "on x=10..10,y=10..10,z=10..10",
+]
+
+
+def brute_force(cubes) -> int:
+    """Counts lit cores one at a time."""
+    lit = set()
+    for c in cubes:
+        points = itertools.product(
+            range(c.xmin, c.xmax + 1),
+            range(c.ymin, c.ymax + 1),
+            range(c.zmin, c.zmax + 1),
+        )
+        if c.add:
+            lit.update(points)
+        else:
+            lit.difference_update(points)
+    return len(lit)
+
+
+@pytest.mark.parametrize(
+    "engine",
+    [count_on_disjoint, count_on_inclusion_exclusion, count_on_vectorized],
+)
+def test_examples(engine):
+    """The examples from the puzzle description."""
+    assert run_sequence(SMALL_EXAMPLE, engine=engine) == 39
+    with open(utils.test_input_location(day=22)) as f:
+        assert run_sequence(f, engine=engine) == 590784
+
+
+def test_subtract():
+    """Subtracting leaves disjoint pieces with the remaining volume."""
+    a = Cube(True, 0, 9, 0, 9, 0, 9)
+    b = Cube(False, 3, 5, -4, 4, 8, 20)
+    pieces = a.subtract(b)
+    assert sum(p.count_on() for p in pieces) == 1000 - 3 * 5 * 2
+    for p1, p2 in itertools.combinations(pieces, 2):
+        assert p1.intersection(p2) is None
+    assert a.subtract(Cube(True, 20, 21, 0, 1, 0, 1)) == [a]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_engines_agree(seed):
+    """The BoxTree agrees with brute force, splitting aggressively."""
+    cubes = random_reboot_steps(60, seed=seed, extent=12, max_size=8)
+    tree = BoxTree(leaf_size=2)
+    for c in cubes:
+        tree.apply(c)
+    expected = brute_force(cubes)
+    assert tree.count_on() == expected
+    assert count_on_disjoint(cubes) == expected
+    assert count_on_vectorized(cubes) == expected
+    assert count_on_inclusion_exclusion(cubes[:25]) == brute_force(cubes[:25])
+
+
+def test_cube_set():
+    """CubeSet matches the scalar Cube methods."""
+    cubes = random_reboot_steps(40, seed=7, extent=20, max_size=15)
+    cube_set = CubeSet.from_cubes(cubes)
+    assert list(cube_set) == cubes
+    assert cube_set.volume() == sum(c.count_on() for c in cubes)
+
+    probe = Cube(True, -5, 5, -5, 5, -5, 5)
+    expected = [c.intersection(probe) for c in cubes]
+    assert list(cube_set.intersect_all(probe)) == [
+        c for c in expected if c is not None
+    ]
+
+
+def test_input_part_1():
+    """Part 1 of the real input."""
+    cubes = read_cubes(utils.input_location(day=22), bound=True)
+    assert count_on_disjoint(cubes) == count_on_inclusion_exclusion(cubes)
+
+
+def test_input_part_2():
+    """Part 2 of the real input, which inclusion-exclusion takes minutes on."""
+    cubes = read_cubes(utils.input_location(day=22))
+    assert count_on_disjoint(cubes) == 1225064738333321
+    assert count_on_vectorized(cubes) == 1225064738333321
+
+
+def test_reactor_queries():
+    """Point and region queries between steps match brute force."""
+    cubes = random_reboot_steps(40, seed=3, extent=10, max_size=7)
+    region = Cube(True, -4, 6, -10, 2, 0, 9)
+    reactor = Reactor()
+    points = set()
+    for c in cubes:
+        reactor.apply(c)
+        cores = itertools.product(
+            range(c.xmin, c.xmax + 1),
+            range(c.ymin, c.ymax + 1),
+            range(c.zmin, c.zmax + 1),
+        )
+        if c.add:
+            points.update(cores)
+        else:
+            points.difference_update(cores)
+
+        assert reactor.count_on() == len(points)
+        assert reactor.count_on(region) == sum(
+            region.xmin <= x <= region.xmax
+            and region.ymin <= y <= region.ymax
+            and region.zmin <= z <= region.zmax
+            for x, y, z in points
+        )
+    assert reactor.steps == 40
+
+    for point in itertools.product(range(-11, 12, 3), repeat=3):
+        assert reactor.is_on(*point) == (point in points)
+
+
+def test_reactor_instructions():
+    """Steps can be given as instruction strings."""
+    reactor = Reactor()
+    for instruction in SMALL_EXAMPLE:
+        reactor.apply(instruction)
+    assert reactor.count_on() == 39
+    assert reactor.is_on(10, 10, 10)
+    assert not reactor.is_on(9, 9, 9)
+    assert reactor.count_on(Cube(True, 12, 13, 12, 13, 12, 13)) == 8
+    with pytest.raises(ValueError):
+        reactor.apply("reboot")
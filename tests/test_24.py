@@ -0,0 +1,144 @@
+"""
+day 24 tests.
+"""
+
+import itertools
+import random
+import numpy as np
+import pytest
+from advent_of_code.day_24 import (
+    compile_block,
+    read_program,
+    run,
+    search,
+)
+from advent_of_code import utils
+
+
+def interpret(blocks, digits) -> int:
+    """Steps through the instructions one at a time, as the ALU would."""
+    registers = dict.fromkeys("wxyz", 0)
+    for block, digit in zip(blocks, digits):
+        registers["w"] = digit
+        for op, a, b in block:
+            value = registers[b] if b in registers else int(b)
+            if op == "add":
+                registers[a] += value
+            elif op == "mul":
+                registers[a] *= value
+            elif op == "div":
+                registers[a] = int(registers[a] / value)
+            elif op == "mod":
+                registers[a] %= value
+            elif op == "eql":
+                registers[a] = int(registers[a] == value)
+    return registers["z"]
+
+
+def monad_block(divisor: int, check: int, offset: int) -> list:
+    """A block in the shape of the puzzle's MONAD blocks."""
+    text = f"""mul x 0
+        add x z
+        mod x 26
+        div z {divisor}
+        add x {check}
+        eql x w
+        eql x 0
+        mul y 0
+        add y 25
+        mul y x
+        add y 1
+        mul z y
+        mul y 0
+        add y w
+        add y {offset}
+        mul y x
+        add z y"""
+    return [tuple(line.split()) for line in text.splitlines()]
+
+
+def test_read_program(tmp_path):
+    program = tmp_path / "program.txt"
+    program.write_text("inp w\nadd z w\n\ninp w\nmul z 3\n")
+    assert read_program(str(program)) == [
+        [("add", "z", "w")],
+        [("mul", "z", "3")],
+    ]
+    program.write_text("inp x\n")
+    with pytest.raises(ValueError):
+        read_program(str(program))
+
+
+def test_compile_folds_constants():
+    block = compile_block(monad_block(1, 11, 7))
+    assert "mul" not in block.source
+    assert "_div" not in block.source  # div z 1
+    assert block.z_divisor == 1
+    assert compile_block(monad_block(26, -8, 3)).z_divisor == 26
+    with pytest.raises(ValueError):
+        compile_block([("add", "z", "x")])  # x is never set
+
+
+def test_division_truncates():
+    block = compile_block([("div", "z", "w")])
+    z = np.array([7, -7, 6, -6])
+    assert block.kernel(np.full(4, 2), z).tolist() == [3, -3, 3, -3]
+
+
+def test_kernels_match_interpreter():
+    program = read_program(utils.input_location(day=24))
+    blocks = [compile_block(block) for block in program]
+    rng = random.Random(0)
+    for _ in range(50):
+        digits = [rng.randint(1, 9) for _ in program]
+        assert run(blocks, digits) == interpret(program, digits)
+
+
+def test_search_matches_brute_force():
+    program = [
+        monad_block(1, 12, 4),
+        monad_block(1, 11, 2),
+        monad_block(26, -3, 5),
+        monad_block(26, -6, 1),
+    ]
+    blocks = [compile_block(block) for block in program]
+    valid = [
+        int("".join(map(str, digits)))
+        for digits in itertools.product(range(1, 10), repeat=4)
+        if interpret(program, digits) == 0
+    ]
+    assert valid
+    assert search(blocks) == (max(valid), min(valid))
+
+
+def test_monad_shape():
+    assert compile_block(monad_block(26, -8, 3)).only_divides_z
+    # a negative offset can take z down as well.
+    assert not compile_block(monad_block(26, -8, -3)).only_divides_z
+    assert not compile_block([("add", "z", "w")]).only_divides_z
+
+
+@pytest.mark.parametrize(
+    "last", [("mul", "z", "0"), ("mod", "z", "5"), ("add", "z", "-83")]
+)
+def test_search_other_blocks(last):
+    program = [[("add", "z", "w")], monad_block(1, 12, 4), [last]]
+    blocks = [compile_block(block) for block in program]
+    valid = [
+        int("".join(map(str, digits)))
+        for digits in itertools.product(range(1, 10), repeat=3)
+        if interpret(program, digits) == 0
+    ]
+    assert valid
+    assert search(blocks) == (max(valid), min(valid))
+
+
+def test_search_without_solutions():
+    blocks = [compile_block(monad_block(1, 12, 4))]
+    assert search(blocks) == (None, None)
+
+
+def test_real_input():
+    program = read_program(utils.input_location(day=24))
+    blocks = [compile_block(block) for block in program]
+    assert search(blocks) == (95299897999897, 31111121382151)
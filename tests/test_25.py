@@ -0,0 +1,63 @@
+"""
+day 25 tests.
+"""
+
+import os
+import numpy as np
+import pytest
+from advent_of_code.day_25 import SeaFloor, _roll_into
+from advent_of_code import utils
+
+
+def test_roll_into():
+    a = np.arange(12).reshape(3, 4)
+    out = np.empty_like(a)
+    for axis in (0, 1):
+        for shift in (1, -1):
+            _roll_into(out, a, shift, axis)
+            assert (out == np.roll(a, shift, axis)).all()
+
+
+def test_repr_round_trip():
+    lines = ["v...>>.vv>", ".vv>>.vv.."]
+    floor = SeaFloor.from_lines(lines)
+    assert repr(floor) == "v...>>.vv>\n.vv>>.vv..\n"
+
+
+def test_single_row_wraps():
+    floor = SeaFloor.from_lines(["...>>>>>..."])
+    floor.move_east_herd()
+    assert repr(floor) == "...>>>>.>..\n"
+    floor = SeaFloor.from_lines([">.>"])
+    assert floor.move_east_herd() == 1
+    assert repr(floor) == ".>>\n"
+
+
+def test_example_steps():
+    floor = SeaFloor.from_file(utils.test_input_location(day=25))
+    for step in range(1, 59):
+        assert floor.step() > 0 or step == 58
+        expected = f"data/day_25/test_step_{step}.txt"
+        if os.path.exists(expected):
+            assert floor == SeaFloor.from_file(expected)
+
+
+def test_steps_until_stable():
+    floor = SeaFloor.from_file(utils.test_input_location(day=25))
+    assert floor.steps_until_stable() == 58
+    floor = SeaFloor.from_file(utils.test_input_location(day=25))
+    with pytest.raises(RuntimeError):
+        floor.steps_until_stable(max_steps=10)
+
+
+def test_random_keeps_cucumbers():
+    floor = SeaFloor.random((64, 48), density=0.4, seed=3)
+    counts = np.bincount(floor.grid.ravel(), minlength=3)
+    for _ in range(10):
+        floor.step()
+    assert (np.bincount(floor.grid.ravel(), minlength=3) == counts).all()
+
+
+def test_real_input():
+    floor = SeaFloor.from_file(utils.input_location(day=25))
+    assert floor.steps_until_stable() == 507
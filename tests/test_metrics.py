@@ -0,0 +1,75 @@
+"""
+metrics tests.
+"""
+
+from advent_of_code import metrics
+from advent_of_code.day_16 import Packet, compile_hex, evaluate_hex
+from advent_of_code.day_18 import str2sailfishnumber
+from advent_of_code.day_21 import dirac_wins
+from advent_of_code.day_22 import count_on_inclusion_exclusion, read_cubes
+from advent_of_code import utils
+
+
+def test_disabled_records_nothing():
+    assert not metrics.enabled()
+    metrics.count("nothing")
+    metrics.observe("nothing", 1)
+    with metrics.timer("nothing"):
+        pass
+    with metrics.collect() as report:
+        assert metrics.enabled()
+    assert not metrics.enabled()
+    assert report.as_dict() == {"counters": {}, "timers": {}, "histograms": {}}
+
+
+def test_hooks():
+    with metrics.collect() as outer:
+        metrics.count("a")
+        with metrics.collect() as inner:
+            metrics.count("a", 2)
+            for value in (0, 1, 3, 4):
+                metrics.observe("h", value)
+            with metrics.timer("t"):
+                pass
+    assert outer.counters["a"] == 3
+    assert inner.counters["a"] == 2
+    h = inner.as_dict()["histograms"]["h"]
+    assert (h["count"], h["total"], h["min"], h["max"]) == (4, 8, 0, 4)
+    assert h["buckets"] == {"<=0": 1, "<2^1": 1, "<2^2": 1, "<2^3": 1}
+    assert outer.timers["t"].count == 1
+    assert "a" in outer.format()
+
+
+def test_day_16():
+    with metrics.collect() as report:
+        Packet.from_hex("8A004A801A8002F478")
+        compile_hex.cache_clear()
+        evaluate_hex.cache_clear()
+        evaluate_hex("C200B40A82")
+        evaluate_hex("C200B40A82")
+    # 4 packets in the tree, 3 streamed, and one compile for two calls.
+    assert report.counters["day_16.packets"] == 7
+    assert report.counters["day_16.compile_hex.misses"] == 1
+
+
+def test_day_18():
+    a = str2sailfishnumber("[[[[4,3],4],4],[7,[[8,4],9]]]")
+    b = str2sailfishnumber("[1,1]")
+    with metrics.collect() as report:
+        assert a.add(b) == str2sailfishnumber(
+            "[[[[0,7],4],[[7,8],[6,0]]],[8,1]]"
+        )
+    assert report.counters["day_18.explodes"] == 3
+    assert report.counters["day_18.splits"] == 2
+
+
+def test_day_21_and_22():
+    with metrics.collect() as report:
+        dirac_wins(4, 8)
+        count_on_inclusion_exclusion(
+            read_cubes(utils.test_input_location(day=22), bound=True)[:4]
+        )
+    assert report.counters["day_21.turns"] > 0
+    assert report.histograms["day_21.live_states"].count > 0
+    # the four steps meet 0, 1, 3 and 7 signed cubes already kept.
+    assert report.counters["day_22.intersections"] == 11
@@ -0,0 +1,44 @@
+"""
+package import tests.
+"""
+
+import subprocess
+import sys
+import pytest
+import advent_of_code
+
+
+def modules_loaded_by(statement: str) -> set:
+    """Returns the advent_of_code modules loaded by running statement."""
+    out = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"{statement}; import sys; "
+            "print(' '.join(m for m in sys.modules "
+            "if m.startswith('advent_of_code')))",
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return set(out.split())
+
+
+def test_import_is_lazy():
+    """Importing the package or utils loads no day modules."""
+    assert modules_loaded_by("import advent_of_code") == {"advent_of_code"}
+    assert modules_loaded_by("from advent_of_code import input_location") == {
+        "advent_of_code",
+        "advent_of_code.utils",
+    }
+
+
+def test_lazy_names():
+    """Exported names resolve to the day modules' objects."""
+    from advent_of_code.day_22 import Cube
+
+    assert advent_of_code.Cube is Cube
+    assert "Cube" in dir(advent_of_code)
+    with pytest.raises(AttributeError):
+        advent_of_code.NotAName
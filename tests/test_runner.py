@@ -0,0 +1,54 @@
+"""
+runner tests.
+"""
+
+import json
+import pytest
+from advent_of_code import runner
+from advent_of_code.__main__ import main
+
+
+def test_discover_days():
+    days = runner.discover_days()
+    assert days[16] == "advent_of_code.day_16"
+    assert (21, 1) in runner.solvers([21])
+    with pytest.raises(ValueError):
+        runner.solvers([99])
+
+
+def test_run_part():
+    result = runner.run_part(21, 1)
+    assert result.error is None
+    assert result.answer == "679329"
+    assert result.wall_seconds >= 0 and result.cpu_seconds >= 0
+
+
+@pytest.mark.parametrize(
+    "platform, maxrss", [("linux", 50 << 10), ("darwin", 50 << 20)]
+)
+def test_peak_rss_units(monkeypatch, platform, maxrss):
+    if runner.resource is None:
+        pytest.skip("resource is not available")
+    usage = type("Usage", (), {"ru_maxrss": maxrss})
+    monkeypatch.setattr(runner.sys, "platform", platform)
+    monkeypatch.setattr(runner.resource, "getrusage", lambda who: usage)
+    assert runner._peak_rss_mb() == 50
+
+
+def test_run_pool():
+    results = runner.run([16, 21], jobs=2)
+    assert [(r.day, r.part) for r in results] == [
+        (16, 1),
+        (16, 2),
+        (21, 1),
+        (21, 2),
+    ]
+    assert results[1].answer == "2536453523344"
+    assert all(r.error is None for r in results)
+
+
+def test_main_json(capsys):
+    assert main(["run", "21", "--jobs", "1", "--json"]) == 0
+    rows = json.loads(capsys.readouterr().out)
+    assert rows[0]["answer"] == "679329"
+    assert rows[1]["answer"] == "433315766324816"
@@ -0,0 +1,141 @@
+"""
+utils tests.
+"""
+
+import io
+import os
+import numpy as np
+import pytest
+from advent_of_code import utils
+
+
+@pytest.fixture
+def day_dir(tmp_path, monkeypatch):
+    """A scratch data/day_99 directory with its own parse cache."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(utils, "CACHE_DIR", str(tmp_path / "cache"))
+    path = tmp_path / "data" / "day_99"
+    path.mkdir(parents=True)
+    return path
+
+
+def test_digit_grid(day_dir):
+    """Digit grids come back as uint8 arrays, with or without newline."""
+    expected = np.array([[2, 1, 9], [3, 9, 8]], dtype=np.uint8)
+    for text in ["219\n398\n", "219\n398", "219\r\n398\r\n"]:
+        (day_dir / "input.txt").write_bytes(text.encode())
+        grid = utils.load_input(99, "digit_grid", cache=False)
+        assert grid.dtype == np.uint8
+        assert (grid == expected).all()
+
+
+def test_wide_digit_grid(day_dir, monkeypatch):
+    """Rows wider than a page still take the reshape path."""
+    rows = ["1234567890" * 500, "0987654321" * 500]
+    (day_dir / "input.txt").write_text("\n".join(rows) + "\n")
+    monkeypatch.setattr(np, "array", None)  # the per-line fallback
+    grid = utils.load_input(99, "digit_grid", cache=False)
+    assert grid.shape == (2, 5000)
+    assert grid[0, :10].tolist() == [1, 2, 3, 4, 5, 6, 7, 8, 9, 0]
+    assert grid[1, -1] == 1
+
+
+def test_parsers(day_dir):
+    """The bulk parsers on small inputs."""
+    (day_dir / "input.txt").write_text("1 10\n2 20\n\n3 30\n")
+    assert utils.load_input(99, "int_columns") == [[1, 2, 3], [10, 20, 30]]
+    (day_dir / "input.txt").write_text("3,4,3,1,2\n")
+    assert utils.load_input(99, "comma_ints") == [3, 4, 3, 1, 2]
+    (day_dir / "input.txt").write_text("0,9 -> 5,9\n8,0 -> 0,8\n")
+    assert utils.load_input(
+        99,
+        "regex_records",
+        pattern=r"(\d+),(\d+) -> (\d+),(\d+)",
+        types=[int] * 4,
+    ) == [(0, 9, 5, 9), (8, 0, 0, 8)]
+    assert utils.load_input(99, "lines") == ["0,9 -> 5,9", "8,0 -> 0,8"]
+
+
+def test_cache(day_dir):
+    """Parsed results are cached by content, parser and arguments."""
+    calls = []
+
+    def count_lines(data, scale=1):
+        calls.append(scale)
+        return len(bytes(data).splitlines()) * scale
+
+    def load(**kwargs):
+        return utils.load_input(99, count_lines, cache_key="count", **kwargs)
+
+    (day_dir / "input.txt").write_text("a\nb\n")
+    assert load() == 2
+    assert load() == 2
+    assert load(scale=3) == 6
+    assert calls == [1, 3]
+    assert len(os.listdir(utils.CACHE_DIR)) == 2
+
+    (day_dir / "input.txt").write_text("a\nb\nc\n")
+    assert load() == 3
+    assert calls == [1, 3, 1]
+
+    # a closure is not cached without a cache_key.
+    assert utils.load_input(99, count_lines) == 3
+    assert utils.load_input(99, count_lines) == 3
+    assert calls == [1, 3, 1, 1, 1]
+
+
+def test_cache_tells_parsers_apart(day_dir):
+    """Different parsers of the same file get their own results."""
+    (day_dir / "input.txt").write_text("1,2,3")
+    assert utils.load_input(99, lambda d: bytes(d).split(b",")) == [
+        b"1",
+        b"2",
+        b"3",
+    ]
+    assert utils.load_input(99, lambda d: len(bytes(d))) == 5
+
+    def parse(data):
+        return "v1"
+
+    assert utils.load_input(99, parse) == "v1"
+
+    def parse(data):  # noqa: F811 - the same parser, edited
+        return "v2"
+
+    assert utils.load_input(99, parse) == "v2"
+
+
+def test_empty_file(day_dir):
+    """An empty file cannot be mapped but still parses."""
+    (day_dir / "input.txt").write_text("")
+    assert utils.load_input(99, "lines") == []
+
+
+def test_bits_at():
+    """bits_at agrees with slicing the binary string."""
+    hex = "8A004A801A8002F478"
+    buf = bytes.fromhex(hex)
+    binary = utils.hex_to_binary(hex)
+    for offset in range(0, len(binary), 5):
+        for width in [1, 3, 11, 15, 20]:
+            if offset + width <= len(binary):
+                assert utils.bits_at(buf, offset, width) == utils.bin_to_dec(
+                    binary[offset : offset + width]
+                )
+    with pytest.raises(EOFError):
+        utils.bits_at(buf, len(binary) - 3, 4)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 64])
+def test_iter_hex_chunks(chunk_size):
+    """Chunks decode the same bytes whatever the chunk size."""
+    hex = "D2FE2 8A0\n04A8"
+    chunks = list(utils.iter_hex_chunks(hex, chunk_size))
+    assert b"".join(data for data, _ in chunks) == bytes.fromhex(
+        "D2FE28A004A8"
+    )
+    assert sum(bits for _, bits in chunks) == 48
+
+    odd = list(utils.iter_hex_chunks(io.BytesIO(b"ABC\n"), chunk_size))
+    assert b"".join(data for data, _ in odd) == b"\xab\xc0"
+    assert sum(bits for _, bits in odd) == 12